@@ -0,0 +1,77 @@
+"""
+Run the benchmark suite.
+
+Each ``bench_*`` module exposes a ``run(quick=False)`` function returning a
+dictionary of benchmark names to seconds per operation. Results can be saved
+as JSON and compared against a previous run, e.g. from another version::
+
+    python -m benchmarks --json before.json
+    git checkout my-branch
+    python -m benchmarks --compare before.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+
+import classyconf
+
+from .utils import format_result, report
+
+MODULES = sorted(
+    name[:-3]
+    for name in os.listdir(os.path.dirname(__file__))
+    if name.startswith("bench_") and name.endswith(".py")
+)
+
+
+def compare(results, previous):
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        before = previous.get(name)
+        change = "" if not before or not value else "{:>8.2f}x".format(before / value)
+        print(
+            "{}  {}  {}".format(name.ljust(width), format_result(name, value), change)
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", help="e.g. bench_lookup")
+    parser.add_argument("--quick", action="store_true", help="skip slow cases")
+    parser.add_argument("--json", help="save results to this file")
+    parser.add_argument("--compare", help="compare against a saved results file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.modules or MODULES:
+        module = importlib.import_module("{}.{}".format(__package__, name))
+        print("Running {}...".format(name), file=sys.stderr)
+        for bench, seconds in module.run(quick=args.quick).items():
+            results["{}: {}".format(name[6:], bench)] = seconds
+
+    if args.compare:
+        with open(args.compare) as file_:
+            compare(results, json.load(file_)["results"])
+    else:
+        report(results)
+
+    if args.json:
+        with open(args.json, "w") as file_:
+            json.dump(
+                {
+                    "version": classyconf.__version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "quick": args.quick,
+                    "results": results,
+                },
+                file_,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
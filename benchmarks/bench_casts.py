@@ -0,0 +1,27 @@
+"""
+Throughput of the ``List``, ``Tuple`` and ``Boolean`` casts.
+
+Run with ``python -m benchmarks.bench_casts``.
+"""
+from classyconf.casts import Boolean, List, Tuple
+
+from .utils import per_op, report
+
+SHORT_LIST = "a, b, c"
+LONG_LIST = ", ".join("'item {}'".format(i) if i % 2 else str(i) for i in range(200))
+
+
+def run(quick=False):
+    number = 2000 if quick else 10000
+    as_list, as_tuple, as_boolean = List(), Tuple(), Boolean()
+    return {
+        "List short": per_op(lambda: as_list(SHORT_LIST), number),
+        "List 200 items": per_op(lambda: as_list(LONG_LIST), number // 100),
+        "Tuple short": per_op(lambda: as_tuple(SHORT_LIST), number),
+        "Tuple 200 items": per_op(lambda: as_tuple(LONG_LIST), number // 100),
+        "Boolean": per_op(lambda: as_boolean("Yes"), number * 10),
+    }
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,45 @@
+"""
+Lookup latency of the ``Environment`` loader, reading ``os.environ`` or a
+snapshot of the variables with the prefix.
+
+Run with ``python -m benchmarks.bench_environ``.
+"""
+import os
+
+from classyconf.loaders import Environment, EnvPrefix
+
+from .utils import per_op, report
+
+
+def run(quick=False):
+    number = 20000 if quick else 100000
+    names = ["BENCH_APP_KEY_{}".format(n) for n in range(20)]
+    for name in names:
+        os.environ[name] = "value"
+    keys = [name[len("BENCH_APP_") :] for name in names]
+
+    results = {}
+    try:
+        for label, options in (
+            ("", {}),
+            (" (snapshot)", {"snapshot": True}),
+            (" (snapshot, revalidate=0)", {"snapshot": True, "revalidate": 0}),
+        ):
+            loader = Environment(keyfmt=EnvPrefix("BENCH_APP_"), **options)
+            results["Environment{} found".format(label)] = per_op(
+                lambda: loader["KEY_0"], number
+            )
+            results["Environment{} missing".format(label)] = per_op(
+                lambda: "MISSING" in loader, number
+            )
+            results["Environment{} get_many 20".format(label)] = per_op(
+                lambda: loader.get_many(keys), number // 10
+            )
+    finally:
+        for name in names:
+            del os.environ[name]
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
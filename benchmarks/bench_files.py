@@ -0,0 +1,294 @@
+"""
+First load latency of ``IniFile`` and ``EnvFile``, lookups in layered ``.ini``
+files, and discovery time of ``RecursiveSearch`` on deep directory trees, also
+with the latency of a network mount, a persisted index and a thread pool.
+
+Run with ``python -m benchmarks.bench_files``.
+"""
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from classyconf.loaders import EnvFile, IniFile, LayeredIniFile, RecursiveSearch
+from classyconf.parsers import FastEnvFileParser
+
+from .utils import (
+    envfile_content,
+    human_size,
+    inifile_content,
+    make_tree,
+    per_op,
+    report,
+)
+
+
+def bench_inifile(tempdir, sizes, loader_class=IniFile, label="", **kwargs):
+    results = {}
+    for size in sizes:
+        filename = os.path.join(tempdir, "{}.ini".format(size))
+        content = inifile_content(size)
+        with open(filename, "w") as file_:
+            file_.write(content)
+        # The first option of the section read
+        section = content[content.index("[settings]") :]
+        key = section[section.index("key_") :].split()[0].rstrip(":")
+
+        def first_load():
+            return "key_0" in loader_class(filename, **kwargs)
+
+        number = max(1, 256 * 1024 // size)
+        name = "{}{} first load {}".format(
+            loader_class.__name__, label, human_size(size)
+        )
+        results[name] = per_op(first_load, number, repeat=3)
+
+        loader = loader_class(filename, **kwargs)
+        name = "{}{} lookup {}".format(loader_class.__name__, label, human_size(size))
+        results[name] = per_op(lambda: loader[key], 10000, repeat=3)
+    return results
+
+
+def bench_envfile(tempdir, sizes):
+    results = {}
+    for size in sizes:
+        filename = os.path.join(tempdir, "{}.env".format(size))
+        with open(filename, "w") as file_:
+            file_.write(envfile_content(size))
+
+        number = max(1, 256 * 1024 // size)
+        for mode, options in (
+            ("", {}),
+            (" (lazy)", {"lazy": True}),
+            (" (mmap)", {"mmap": True}),
+        ):
+
+            def first_lookup():
+                loader = EnvFile(filename, parser=FastEnvFileParser, **options)
+                return loader["KEY_1"]
+
+            name = "EnvFile{} first lookup {}".format(mode, human_size(size))
+            results[name] = per_op(first_lookup, number, repeat=3)
+    return results
+
+
+def bench_revalidate(tempdir, number):
+    filename = os.path.join(tempdir, "revalidate.env")
+    with open(filename, "w") as file_:
+        file_.write(envfile_content(1024))
+
+    results = {}
+    for revalidate in (0, 1, None):
+        loader = EnvFile(filename, revalidate=revalidate)
+        name = "EnvFile lookup (revalidate={})".format(revalidate)
+        results[name] = per_op(lambda: loader["KEY_1"], number)
+    return results
+
+
+def bench_shared(tempdir, size, loaders=10):
+    filename = os.path.join(tempdir, "shared.ini")
+    with open(filename, "w") as file_:
+        file_.write(inifile_content(size))
+
+    results = {}
+    for shared in (False, True):
+
+        def first_loads():
+            for _ in range(loaders):
+                "key_0" in IniFile(filename, shared=shared)
+
+        name = "{} IniFile{} first loads {}".format(
+            loaders, " (shared)" if shared else "", human_size(size)
+        )
+        results[name] = per_op(first_loads, 10, repeat=3)
+    return results
+
+
+def bench_layered(tempdir, layers, number):
+    filenames = []
+    for layer in range(layers):
+        filename = os.path.join(tempdir, "layer_{}.ini".format(layer))
+        with open(filename, "w") as file_:
+            file_.write("[settings]\nkey_{0}=value\nshared=layer {0}\n".format(layer))
+        filenames.append(filename)
+    last = "key_{}".format(layers - 1)
+
+    def probe(loaders, key):
+        # What ``Configuration`` does with a list of loaders.
+        for loader in loaders:
+            try:
+                return loader[key]
+            except KeyError:
+                continue
+
+    results = {}
+    chain = [IniFile(filename) for filename in filenames]
+    layered = [LayeredIniFile(filenames)]
+    for name, loaders in (("IniFile", chain), ("LayeredIniFile", layered)):
+        for key in (last, "missing"):
+            label = "{} {} layers lookup {}".format(name, layers, key)
+            results[label] = per_op(lambda: probe(loaders, key), number)
+    return results
+
+
+def bench_discovery(tempdir, depths):
+    results = {}
+    for depth in depths:
+        root = os.path.join(tempdir, "tree_{}".format(depth))
+        os.mkdir(root)
+        start = make_tree(root, depth, config_at=(0, depth - 2))
+        key = "LEVEL_{}".format(depth - 2)
+
+        def discover():
+            search = RecursiveSearch(start, root_path=root)
+            search._discover()
+
+        name = "RecursiveSearch discover depth {}".format(depth)
+        results[name] = per_op(discover, 20, repeat=3)
+
+        for label, lazy in (("", False), (" (lazy)", True)):
+
+            def first_lookup():
+                return RecursiveSearch(start, root_path=root, lazy=lazy)[key]
+
+            name = "RecursiveSearch{} first lookup depth {}".format(label, depth)
+            results[name] = per_op(first_lookup, 20, repeat=3)
+    return results
+
+
+def bench_search_lookup(tempdir, levels, number):
+    root = os.path.join(tempdir, "search_tree")
+    os.mkdir(root)
+    start = make_tree(root, levels - 1, config_at=range(levels))
+
+    results = {}
+    for revalidate in (0, None):
+        search = RecursiveSearch(start, root_path=root, revalidate=revalidate)
+        for key in ("LEVEL_{}".format(levels - 1), "LEVEL_0", "MISSING"):
+            name = "RecursiveSearch {} files lookup {} (revalidate={})".format(
+                levels * 2, key, revalidate
+            )
+            results[name] = per_op(lambda: key in search, number)
+    return results
+
+
+@contextmanager
+def slow_filesystem(latency):
+    """
+    Add ``latency`` seconds to every directory listing and ``stat`` call, as
+    on a network mount.
+    """
+    originals = {name: getattr(os, name) for name in ("scandir", "stat", "lstat")}
+
+    def slow(call):
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return call(*args, **kwargs)
+
+        return wrapper
+
+    for name, call in originals.items():
+        setattr(os, name, slow(call))
+    try:
+        yield
+    finally:
+        for name, call in originals.items():
+            setattr(os, name, call)
+
+
+def bench_slow_discovery(tempdir, depth, latency=0.001):
+    root = os.path.join(tempdir, "slow_tree")
+    os.mkdir(root)
+    start = make_tree(root, depth, config_at=(0, depth - 2))
+    key = "LEVEL_{}".format(depth - 2)
+
+    results = {}
+    for label, lazy in (("", False), (" (lazy)", True)):
+
+        def first_lookup():
+            return RecursiveSearch(start, root_path=root, lazy=lazy)[key]
+
+        name = "RecursiveSearch{} first lookup depth {} ({:g}ms latency)".format(
+            label, depth, latency * 1000
+        )
+        with slow_filesystem(latency):
+            results[name] = per_op(first_lookup, 1, repeat=3)
+    return results
+
+
+def bench_workers(tempdir, depth, latency=0.001):
+    root = os.path.join(tempdir, "workers_tree")
+    os.mkdir(root)
+    start = make_tree(root, depth, config_at=range(depth + 1))
+
+    results = {}
+    for workers in (None, 8):
+
+        def preload():
+            RecursiveSearch(start, root_path=root, workers=workers).preload()
+
+        name = "RecursiveSearch preload {} files (workers={})".format(
+            (depth + 1) * 2, workers
+        )
+        results[name] = per_op(preload, 10, repeat=3)
+        with slow_filesystem(latency):
+            name += " ({:g}ms latency)".format(latency * 1000)
+            results[name] = per_op(preload, 1, repeat=3)
+    return results
+
+
+def bench_persist(tempdir, depth, latency=0.001):
+    root = os.path.join(tempdir, "persist_tree")
+    os.mkdir(root)
+    start = make_tree(root, depth, config_at=(0, depth // 2))
+    past = time.time() - 60
+    for path, _, filenames in os.walk(root):
+        if ".env" in filenames:
+            with open(os.path.join(path, ".env"), "a") as file_:
+                file_.write(envfile_content(16 * 1024))
+        # Recently modified files and directories are not persisted.
+        for name in filenames + ["."]:
+            os.utime(os.path.join(path, name), (past, past))
+    index = os.path.join(tempdir, "index")
+    "LEVEL_0" in RecursiveSearch(start, root_path=root, persist=index)
+
+    results = {}
+    for label, options in (("", {}), (" (persist)", {"persist": index})):
+
+        def start_up():
+            # Each new loader stands for a new process.
+            search = RecursiveSearch(start, root_path=root, **options)
+            return search["LEVEL_0"]
+
+        name = "RecursiveSearch{} start up depth {}".format(label, depth)
+        results[name] = per_op(start_up, 20, repeat=3)
+        with slow_filesystem(latency):
+            name += " ({:g}ms latency)".format(latency * 1000)
+            results[name] = per_op(start_up, 1, repeat=3)
+    return results
+
+
+def run(quick=False):
+    tempdir = tempfile.mkdtemp()
+    try:
+        sizes = (1024, 64 * 1024) if quick else (1024, 64 * 1024, 1024 ** 2)
+        depths = (5, 20) if quick else (5, 20, 50)
+        results = bench_inifile(tempdir, sizes)
+        results.update(bench_inifile(tempdir, sizes, label=" (fast)", fast=True))
+        results.update(bench_envfile(tempdir, sizes))
+        results.update(bench_shared(tempdir, sizes[-1]))
+        results.update(bench_revalidate(tempdir, 20000 if quick else 100000))
+        results.update(bench_layered(tempdir, 3, 20000 if quick else 100000))
+        results.update(bench_discovery(tempdir, depths))
+        results.update(bench_slow_discovery(tempdir, depths[1]))
+        results.update(bench_workers(tempdir, depths[1]))
+        results.update(bench_persist(tempdir, depths[1]))
+        results.update(bench_search_lookup(tempdir, 5, 10000 if quick else 50000))
+        return results
+    finally:
+        shutil.rmtree(tempdir)
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,60 @@
+"""
+Import time of the package, as reported by ``python -X importtime``.
+
+Run with ``python -m benchmarks.bench_import``.
+"""
+import statistics
+import subprocess
+import sys
+
+from .utils import report
+
+STATEMENTS = {
+    "import classyconf": "import classyconf",
+    "import Configuration, Environment": (
+        "from classyconf import Configuration, Environment"
+    ),
+    "import everything": "from classyconf import *",
+}
+
+
+def import_time(statement):
+    """
+    Seconds spent importing the modules ``statement`` imports, not counting
+    the interpreter startup.
+    """
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    startup = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in baseline.stderr.decode().splitlines()
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.decode().splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, self_us, _, name = line.replace(":", "|", 1).split("|")
+        if name.strip() not in startup:
+            total += int(self_us)
+    return total / 1e6
+
+
+def run(quick=False):
+    repeat = 5 if quick else 15
+    return {
+        name: statistics.median(import_time(statement) for _ in range(repeat))
+        for name, statement in STATEMENTS.items()
+    }
+
+
+if __name__ == "__main__":
+    report(run())
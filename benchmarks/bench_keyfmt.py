@@ -0,0 +1,65 @@
+"""
+Time and memory allocated per call of ``keyfmt`` functions, and per lookup in
+loaders using them, with and without memoization. Memory is measured with
+``tracemalloc``, keeping every result alive so strings built anew add up.
+
+Run with ``python -m benchmarks.bench_keyfmt``.
+"""
+import os
+import tracemalloc
+
+from classyconf.loaders import Environment, EnvPrefix, MemoizedKeyfmt
+
+from .utils import per_op, report
+
+
+def plain(value):
+    # What ``EnvPrefix("BENCH_APP_")`` did before memoizing.
+    return "BENCH_APP_{}".format(value.upper())
+
+
+def allocated(func, number):
+    """
+    Bytes allocated per call to ``func`` that stay allocated while its result
+    is referenced.
+    """
+    results = []
+    func()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(number):
+            results.append(func())
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list of results itself grows by one pointer per call.
+    return (after - before) / number - 8
+
+
+def run(quick=False):
+    number = 20000 if quick else 100000
+    os.environ["BENCH_APP_DEBUG"] = "yes"
+
+    results = {}
+    try:
+        for name, keyfmt in (
+            ("plain", plain),
+            ("MemoizedKeyfmt", MemoizedKeyfmt(plain)),
+            ("EnvPrefix", EnvPrefix("BENCH_APP_")),
+        ):
+            loader = Environment(keyfmt=keyfmt)
+            results["{} keyfmt".format(name)] = per_op(lambda: keyfmt("debug"), number)
+            results["Environment {} lookup".format(name)] = per_op(
+                lambda: loader["debug"], number
+            )
+            results["{} keyfmt allocated bytes".format(name)] = allocated(
+                lambda: keyfmt("debug"), number // 10
+            )
+    finally:
+        del os.environ["BENCH_APP_DEBUG"]
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
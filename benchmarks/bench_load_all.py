@@ -0,0 +1,39 @@
+"""
+Startup cost of resolving every declared value of a big configuration, one
+attribute at a time versus ``Configuration.load_all()``.
+
+Run with ``python -m benchmarks.bench_load_all``.
+"""
+from classyconf import Configuration, Value
+from classyconf.loaders import Dict
+
+from .utils import per_op, report
+
+SIZE = 300
+
+BigConfig = type(
+    "BigConfig",
+    (Configuration,),
+    {"VALUE_{}".format(i): Value(default="") for i in range(SIZE)},
+)
+
+
+def run(quick=False):
+    number = 50 if quick else 200
+    loaders = [
+        Dict({}),
+        Dict({}),
+        Dict({"VALUE_{}".format(i): "x" for i in range(0, SIZE, 3)}),
+    ]
+    config = BigConfig(loaders=loaders)
+    keys = list(config._declared_values)
+    return {
+        "attributes ({} values)".format(SIZE): per_op(
+            lambda: [getattr(config, key) for key in keys], number
+        ),
+        "load_all ({} values)".format(SIZE): per_op(config.load_all, number),
+    }
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,46 @@
+"""
+Attribute access latency for ``Configuration`` values.
+
+``call`` goes through ``Configuration.__call__``, which resolves the cast on
+every lookup like attribute access used to do, while ``attribute`` uses the
+plan compiled by the metaclass.
+
+Run with ``python -m benchmarks.bench_lookup``.
+"""
+from classyconf import Configuration, Value
+from classyconf.loaders import Dict
+
+from .utils import per_op, report
+
+
+class BenchConfig(Configuration):
+    FOUND = Value(default=0)
+    MISSING = Value(default=False)
+
+
+def run(quick=False):
+    number = 20000 if quick else 100000
+    loaders = [Dict({}), Dict({}), Dict({"FOUND": "42"})]
+    results = {}
+    for cache in (False, True):
+        config = BenchConfig(loaders=loaders, cache=cache)
+        suffix = " (cache)" if cache else ""
+        results["call found" + suffix] = per_op(
+            lambda: config("FOUND", default=0), number
+        )
+        results["attribute found" + suffix] = per_op(lambda: config.FOUND, number)
+        results["call default" + suffix] = per_op(
+            lambda: config("MISSING", default=False), number
+        )
+        results["attribute default" + suffix] = per_op(lambda: config.MISSING, number)
+    config = BenchConfig(loaders=loaders, negative_cache=True)
+    results["attribute default (negative cache)"] = per_op(
+        lambda: config.MISSING, number
+    )
+    frozen = BenchConfig(loaders=loaders).freeze()
+    results["frozen attribute"] = per_op(lambda: frozen.FOUND, number)
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
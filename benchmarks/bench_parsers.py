@@ -0,0 +1,50 @@
+"""
+Throughput of ``EnvFileParser``, ``FastEnvFileParser`` and
+``MmapEnvFileParser`` on generated ``.env`` files.
+
+Run with ``python -m benchmarks.bench_parsers``.
+"""
+import io
+import os
+import tempfile
+
+from classyconf.parsers import EnvFileParser, FastEnvFileParser, MmapEnvFileParser
+
+from .utils import envfile_content, human_size, per_op, report
+
+SIZES = (1024, 1024 ** 2, 50 * 1024 ** 2)
+QUICK_SIZES = (1024, 100 * 1024)
+
+
+def parse(parser_class, content):
+    return dict(parser_class(io.StringIO(content)).parse_config())
+
+
+def parse_mapped(filename):
+    with open(filename, "rb") as file_:
+        return MmapEnvFileParser(file_).parse()
+
+
+def run(quick=False, parsers=(EnvFileParser, FastEnvFileParser)):
+    results = {}
+    for size in QUICK_SIZES if quick else SIZES:
+        content = envfile_content(size)
+        number = max(1, 1024 ** 2 // size)
+        repeat = 1 if size > 1024 ** 2 else 3
+        for parser_class in parsers:
+            name = "{} {}".format(parser_class.__name__, human_size(size))
+            results[name] = per_op(lambda: parse(parser_class, content), number, repeat)
+
+        fd, filename = tempfile.mkstemp(suffix=".env")
+        try:
+            with os.fdopen(fd, "w") as file_:
+                file_.write(content)
+            name = "MmapEnvFileParser {}".format(human_size(size))
+            results[name] = per_op(lambda: parse_mapped(filename), number, repeat)
+        finally:
+            os.remove(filename)
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,105 @@
+import os
+import random
+import timeit
+
+
+def per_op(func, number=100000, repeat=5):
+    """
+    Best of ``repeat`` runs of ``number`` calls to ``func``, in seconds per call.
+    """
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_result(name, value):
+    """
+    Results are seconds per operation, or bytes if their name ends with
+    ``bytes``.
+    """
+    if name.endswith("bytes"):
+        return "{:>12.1f} B ".format(value)
+    return "{:>12.3f} us".format(value * 1e6)
+
+
+def report(results):
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print("{}  {}".format(name.ljust(width), format_result(name, value)))
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return "{:g}{}".format(size, unit)
+        size /= 1024
+
+
+def envfile_content(size, seed=0):
+    """
+    Generate a ``.env`` file of about ``size`` bytes, mixing plain values with
+    quotes, comments and line continuations.
+    """
+    rnd = random.Random(seed)
+    templates = (
+        "KEY_{n}=value_{n}\n",
+        "KEY_{n} = 'quoted value {n}'\n",
+        'KEY_{n}="double # quoted {n}"\n',
+        "KEY_{n}=value  # inline comment {n}\n",
+        "# comment line {n}\n",
+        "KEY_{n}=multiple \\\nlines {n}\n",
+        "\n",
+    )
+    lines = []
+    total = 0
+    n = 0
+    while total < size:
+        line = rnd.choice(templates).format(n=n)
+        lines.append(line)
+        total += len(line)
+        n += 1
+    return "".join(lines)
+
+
+def inifile_content(size, section="settings", seed=0):
+    """
+    Generate an ``.ini`` file of about ``size`` bytes, where ``section`` is
+    the last of several sections.
+    """
+    rnd = random.Random(seed)
+    sections = ["other_{}".format(i) for i in range(3)] + [section]
+    per_section = max(size // len(sections), 1)
+    lines = []
+    n = 0
+    for name in sections:
+        lines.append("[{}]\n".format(name))
+        total = 0
+        while total < per_section:
+            line = rnd.choice(
+                ("key_{n} = value_{n}\n", "; comment {n}\n", "key_{n}: value {n}\n")
+            ).format(n=n)
+            lines.append(line)
+            total += len(line)
+            n += 1
+    return "".join(lines)
+
+
+def make_tree(root, depth, files_per_dir=5, config_at=None):
+    """
+    Create ``depth`` nested directories under ``root`` with unrelated files,
+    and return the deepest one. Config files are written in the directories
+    listed in ``config_at`` (0 being ``root``).
+    """
+    path = root
+    for level in range(depth + 1):
+        if level:
+            path = os.path.join(path, "level_{}".format(level))
+            os.mkdir(path)
+        for i in range(files_per_dir):
+            with open(os.path.join(path, "file_{}.txt".format(i)), "w") as file_:
+                file_.write("unrelated")
+        if config_at and level in config_at:
+            with open(os.path.join(path, ".env"), "w") as file_:
+                file_.write("LEVEL_{}=yes\n".format(level))
+            with open(os.path.join(path, "settings.ini"), "w") as file_:
+                file_.write("[settings]\nlevel_{}=yes\n".format(level))
+    return path
@@ -1,15 +1,57 @@
-from .casts import Boolean, Identity, List, Option, Tuple
-from .configuration import (
-    NOT_SET,
-    Configuration,
-    Value,
-    as_boolean,
-    as_is,
-    as_list,
-    as_option,
-    as_tuple,
-    evaluate,
-)
-from .loaders import CommandLine, EnvFile, Environment, EnvPrefix, IniFile
-
 __version__ = "0.5.2"
+
+# Submodules are only imported when one of their names is first accessed,
+# so that ``import classyconf`` stays cheap (see ``__getattr__``).
+_exports = {
+    "ForeverCache": "caches",
+    "LRUCache": "caches",
+    "TTLCache": "caches",
+    "Boolean": "casts",
+    "Identity": "casts",
+    "List": "casts",
+    "Option": "casts",
+    "Tuple": "casts",
+    "NOT_SET": "configuration",
+    "Configuration": "configuration",
+    "Value": "configuration",
+    "as_boolean": "configuration",
+    "as_is": "configuration",
+    "as_list": "configuration",
+    "as_option": "configuration",
+    "as_tuple": "configuration",
+    "evaluate": "configuration",
+    "CommandLine": "loaders",
+    "EnvFile": "loaders",
+    "Environment": "loaders",
+    "EnvPrefix": "loaders",
+    "IniFile": "loaders",
+    "MemoizedKeyfmt": "loaders",
+}
+
+# Submodules that used to be imported along with the package, and can still
+# be reached as its attributes.
+_submodules = {"caches", "casts", "configuration", "exceptions", "loaders", "parsers"}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name in _submodules:
+        return import_module("{}.{}".format(__name__, name))
+
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+
+    value = getattr(import_module("{}.{}".format(__name__, module)), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
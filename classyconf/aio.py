@@ -0,0 +1,52 @@
+import asyncio
+
+from .configuration import Configuration
+from .loaders import NOT_SET
+
+
+class AsyncConfiguration(Configuration):
+    """
+    A ``Configuration`` for asyncio applications. Loaders are preloaded
+    concurrently, blocking ones in the default executor, so that lookups
+    don't stall the event loop doing I/O.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._preloading = None
+
+    async def preload(self):
+        """
+        Load every loader concurrently. Concurrent calls share the same
+        preload, and it only happens again after :py:meth:`reset`.
+        """
+        if self._preloading is None:
+            self._preloading = asyncio.ensure_future(
+                asyncio.gather(*(loader.apreload() for loader in self._loaders))
+            )
+        try:
+            await asyncio.shield(self._preloading)
+        except Exception:
+            self._preloading = None
+            raise
+
+    async def aget(self, key, *, default=NOT_SET, cast=None, ttl=None):
+        """
+        Lookup a setting once loaders are preloaded. Declared values use
+        their own default and cast, unless others are given.
+        """
+        await self.preload()
+        if key in self._declared_values and default is NOT_SET and cast is None:
+            return self[key]
+        return self(key, default=default, cast=cast, ttl=ttl)
+
+    async def aload_all(self):
+        """
+        Async version of :py:meth:`Configuration.load_all`.
+        """
+        await self.preload()
+        return self.load_all()
+
+    def reset(self):
+        super().reset()
+        self._preloading = None
@@ -0,0 +1,239 @@
+import os
+from _thread import allocate_lock
+from collections import OrderedDict
+from time import monotonic
+
+
+class AbstractCache(object):
+    """
+    Cache policies decide for how long ``Configuration`` keeps resolved values.
+    Lookups raise ``KeyError`` for values that are not cached or have expired.
+    """
+
+    def __getitem__(self, key):
+        raise NotImplementedError()  # pragma: no cover
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError()  # pragma: no cover
+
+    def invalidate(self, key):
+        raise NotImplementedError()  # pragma: no cover
+
+    def clear(self):
+        raise NotImplementedError()  # pragma: no cover
+
+    def clone(self):
+        """Return a new and empty cache with the same policy."""
+        raise NotImplementedError()  # pragma: no cover
+
+
+class ForeverCache(AbstractCache):
+    """
+    Keep values until the configuration is reset, unless a ``Value`` sets
+    its own ``ttl``.
+    """
+
+    ttl = None
+
+    def __init__(self):
+        self._values = {}
+        self._expires = {}
+
+    def _expired(self, key):
+        expires = self._expires.get(key)
+        return expires is not None and expires <= monotonic()
+
+    def __getitem__(self, key):
+        if self._expires and self._expired(key):
+            self.invalidate(key)
+        return self._values[key]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self._values[key] = value
+        if ttl is None:
+            self._expires.pop(key, None)
+        else:
+            self._expires[key] = monotonic() + ttl
+
+    def invalidate(self, key):
+        self._values.pop(key, None)
+        self._expires.pop(key, None)
+
+    def clear(self):
+        self._values = {}
+        self._expires = {}
+
+    def clone(self):
+        return self.__class__()
+
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
+
+
+class TTLCache(ForeverCache):
+    """
+    Expire values ``ttl`` seconds after they were resolved, so rotated
+    settings are picked up without resetting the configuration.
+    """
+
+    def __init__(self, ttl):
+        """
+        :param float ttl: Seconds to keep each value, unless a ``Value`` sets
+                          its own ``ttl``.
+        """
+        super().__init__()
+        self.ttl = ttl
+
+    def clone(self):
+        return self.__class__(self.ttl)
+
+    def __repr__(self):
+        return "{}(ttl={})".format(self.__class__.__name__, self.ttl)
+
+
+class LRUCache(ForeverCache):
+    """
+    Keep at most ``maxsize`` values, evicting the least recently used.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        """
+        :param int maxsize: Maximum number of values to keep.
+        :param float ttl: Optional seconds to keep each value.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._values = OrderedDict()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self._values.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        super().set(key, value, ttl)
+        self._values.move_to_end(key)
+        while len(self._values) > self.maxsize:
+            self.invalidate(next(iter(self._values)))
+
+    def clear(self):
+        super().clear()
+        self._values = OrderedDict()
+
+    def clone(self):
+        return self.__class__(self.maxsize, self.ttl)
+
+    def __repr__(self):
+        return "{}(maxsize={}, ttl={})".format(
+            self.__class__.__name__, self.maxsize, self.ttl
+        )
+
+
+class ParseCache:
+    """
+    Parsed files shared by loaders across the process, so a file read by
+    several loaders is parsed only once. Entries are found by the real path
+    of the file, and are only used while its mtime, size and inode stay the
+    same, so a file that changed is parsed again.
+    """
+
+    def __init__(self, maxsize=64, realpath=True):
+        """
+        :param int maxsize: Maximum number of parsed files to keep.
+        :param bool realpath: Find entries by the real path of the files, so
+                              that links to a file share its entry. Not needed
+                              if the paths given don't have links.
+        """
+        self.realpath = realpath
+        self._files = LRUCache(maxsize)
+        self._lock = allocate_lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filename, kind, parse, signature=None):
+        """
+        :param str filename: Path of the file.
+        :param kind: Hashable telling how the file is parsed, since loaders
+                     can parse the same file in different ways.
+        :param function parse: Parses the file when it is not cached.
+        :param tuple signature: The mtime, size, inode and device of the
+                                file, if the caller just got them.
+        :return: What ``parse`` returned for the current version of the file.
+        :raises FileNotFoundError: If the file doesn't exist.
+        """
+        if signature is None:
+            stat = os.stat(filename)
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_dev)
+        if self.realpath:
+            filename = os.path.realpath(filename)
+        key = (filename, kind)
+        with self._lock:
+            try:
+                cached, data = self._files[key]
+            except KeyError:
+                cached = None
+            if cached == signature:
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        # Parse outside of the lock, so other files can be read meanwhile. If
+        # the file changes while parsing, the next lookup finds out by its
+        # signature and parses it again.
+        data = parse()
+        with self._lock:
+            self._files.set(key, (signature, data))
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+    def dump(self, file, racy=1):
+        """
+        Write the parsed files to a binary ``file`` with ``pickle``.
+
+        :param file: File object to write to.
+        :param float racy: Leave out the files modified less than these
+                           seconds ago, since they could change again without
+                           changing their mtime.
+        """
+        import pickle
+        from time import time
+
+        limit = (time() - racy) * 1e9
+        with self._lock:
+            entries = [
+                (key, entry)
+                for key, entry in self._files._values.items()
+                if entry[0][0] < limit
+            ]
+        pickle.dump(entries, file, pickle.HIGHEST_PROTOCOL)
+
+    def load(self, file):
+        """
+        Add the parsed files written by :py:meth:`dump` to the cache. They are
+        still only used while their signature matches.
+
+        :param file: Binary file object to read from.
+        """
+        import pickle
+
+        entries = pickle.load(file)
+        with self._lock:
+            for key, entry in entries:
+                self._files.set(key, entry)
+
+    def __len__(self):
+        return len(self._files._values)
+
+    def __bool__(self):
+        # Given as the ``shared`` option of loaders, even when empty.
+        return True
+
+    def __repr__(self):
+        return "{}(maxsize={}, realpath={})".format(
+            self.__class__.__name__, self._files.maxsize, self.realpath
+        )
@@ -1,5 +1,3 @@
-import ast
-
 from .exceptions import InvalidConfiguration
 
 
@@ -118,4 +116,10 @@ class Identity(AbstractCast):
         return value
 
 
-evaluate = ast.literal_eval
+def evaluate(value):
+    """
+    Alias to :py:func:`ast.literal_eval`, imported on first use.
+    """
+    import ast
+
+    return ast.literal_eval(value)
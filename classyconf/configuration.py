@@ -1,10 +1,19 @@
-from collections import OrderedDict
-from typing import Callable
+from __future__ import annotations
+
+from _thread import allocate_lock
+from collections import OrderedDict, namedtuple
 
 from .casts import Boolean, Identity, List, Option, Tuple, evaluate
 from .exceptions import UnknownConfiguration
 from .loaders import NOT_SET, Environment
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Callable
+
+#: Where the value of a setting comes from, see ``Configuration.explain()``.
+Explanation = namedtuple("Explanation", "key value loader location shadowed")
+
 # Shortcuts for standard casts
 as_boolean = Boolean()
 as_list = List()
@@ -13,42 +22,69 @@ as_option = Option
 as_is = Identity()
 
 
-def getconf(item, default=NOT_SET, cast=None, loaders=None):
+def resolve_cast(default=NOT_SET, cast=None):
     """
-    :param item:    Name of the setting to lookup.
-    :param default: Default value if none is provided. If left unset,
-                    loading a config that fails to provide this value
-                    will raise a UnknownConfiguration exception.
+    Pick the callable used to cast values found by the loaders.
+
+    :param default: Default value of the setting, if any.
     :param cast:    Callable to cast variable with. Defaults to type of
                     default (if provided), identity if default is not
                     provided or raises TypeError if provided cast is not
                     callable.
-    :param loaders: A list of loader instances in the order they should be
-                    looked into. Defaults to `[Environment()]`
     """
     if callable(cast):
-        cast = cast
+        return cast
     elif cast is None and (default is NOT_SET or default is None):
-        cast = as_is
+        return as_is
     elif isinstance(default, bool):
-        cast = as_boolean
+        return as_boolean
     elif cast is None:
-        cast = type(default)
+        return type(default)
     else:
         raise TypeError("Cast must be callable")
 
+
+def lookup(item, default, cast, loaders, missing=None):
+    """
+    Walk the loaders looking for ``item``, with an already resolved ``cast``.
+    This is the hot path shared by :py:func:`getconf` and ``Configuration``.
+    If no loader has ``item`` it gets added to the ``missing`` set, if given.
+    """
     for loader in loaders:
         try:
             return cast(loader[item])
         except KeyError:
             continue
 
+    if missing is not None:
+        missing.add(item)
+
+    return fallback(item, default, cast)
+
+
+def fallback(item, default, cast):
     if default is NOT_SET:
         raise UnknownConfiguration("Configuration '{}' not found".format(item))
 
     return cast(default)
 
 
+def getconf(item, default=NOT_SET, cast=None, loaders=None):
+    """
+    :param item:    Name of the setting to lookup.
+    :param default: Default value if none is provided. If left unset,
+                    loading a config that fails to provide this value
+                    will raise a UnknownConfiguration exception.
+    :param cast:    Callable to cast variable with. Defaults to type of
+                    default (if provided), identity if default is not
+                    provided or raises TypeError if provided cast is not
+                    callable.
+    :param loaders: A list of loader instances in the order they should be
+                    looked into. Defaults to `[Environment()]`
+    """
+    return lookup(item, default, resolve_cast(default, cast), loaders)
+
+
 class Value:
     def __init__(
         self,
@@ -57,6 +93,7 @@ class Value:
         help: str = "",
         default: NOT_SET = NOT_SET,
         cast: Callable = None,
+        ttl: float = None,
     ):
         """
         :param key:     Name of the value used in file or environment
@@ -69,19 +106,41 @@ class Value:
                         provided or raises TypeError if provided cast is not
                         callable.
         :param help:    Plain-text description of the value.
+        :param ttl:     Seconds to keep the value cached, when the
+                        configuration cache is enabled. Overrides the
+                        ``ttl`` of the cache policy.
         """
         self.key = key
         self.help = help
         self.default = default
         self.cast = cast
+        self.ttl = ttl
+        self._plan = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in ("key", "default", "cast", "ttl"):
+            # Compiled again on the next access.
+            object.__setattr__(self, "_plan", None)
+
+    def compile(self):
+        """
+        Resolve everything about this value that does not depend on the
+        loaders, so attribute access doesn't have to decide it again.
+        """
+        cast = resolve_cast(self.default, self.cast)
+        self._plan = (self.key, self.default, cast, self.ttl)
+        return self._plan
 
     def __get__(self, instance, owner):
         if instance:
-            return instance(
-                self.key,
-                default=self.default,
-                cast=self.cast,
-            )
+            if type(instance).__call__ is not Configuration.__call__:
+                # Overrides of ``__call__`` see attribute access as well.
+                options = {"default": self.default, "cast": self.cast}
+                if self.ttl is not None:
+                    options["ttl"] = self.ttl
+                return instance(self.key, **options)
+            return instance._resolve(*(self._plan or self.compile()))
         return self
 
     def __repr__(self):
@@ -90,6 +149,111 @@ class Value:
         )
 
 
+class FrozenConfiguration:
+    """
+    Immutable snapshot of the values of a ``Configuration``, as returned by
+    :py:meth:`Configuration.freeze`. Values are plain slotted attributes.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for key, value in zip(self.__slots__, values):
+            object.__setattr__(self, key, value)
+
+    def __iter__(self):
+        yield from zip(self.__slots__, _frozen_values(self))
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __delattr__(self, key):
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenConfiguration):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(_hashable(value) for value in _frozen_values(self)))
+
+    def __reduce__(self):
+        return _thaw, (self.__class__.__name__, self.__slots__, _frozen_values(self))
+
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            ", ".join("{}={!r}".format(key, value) for key, value in self),
+        )
+
+
+def _frozen_values(frozen):
+    # Not a method, since slots named after the values would shadow it.
+    return tuple(getattr(frozen, key) for key in frozen.__slots__)
+
+
+def _hashable(value):
+    """
+    Hashable equivalent of the lists, sets and dictionaries returned by casts,
+    so snapshots holding them are hashable too.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+    return value
+
+
+_frozen_classes = {}
+
+
+def _frozen_class(name, keys):
+    try:
+        return _frozen_classes[name, keys]
+    except KeyError:
+        cls = type(name, (FrozenConfiguration,), {"__slots__": keys})
+        return _frozen_classes.setdefault((name, keys), cls)
+
+
+def _thaw(name, keys, values):
+    return _frozen_class(name, keys)(*values)
+
+
+class _Flight:
+    """
+    A lookup in progress that other threads can wait for.
+    """
+
+    def __init__(self, args):
+        #: The ``default`` and ``cast`` of the lookup.
+        self.args = args
+        # Held until the lookup finishes, so waiters block acquiring it.
+        self._done = allocate_lock()
+        self._done.acquire()
+        self.value = None
+        self.error = None
+
+    def finish(self, value=None, error=None):
+        self.value = value
+        self.error = error
+        self._done.release()
+
+    def wait(self):
+        with self._done:
+            pass
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
 class DeclarativeValuesMetaclass(type):
     """
     Collect Value objects declared on the base classes
@@ -111,6 +275,7 @@ class DeclarativeValuesMetaclass(type):
                         "Don't explicitly set keys when declaring values"
                     )
                 value.key = key
+                value.compile()
                 values.update({key: value})
 
         attrs["_declared_values"] = values
@@ -134,8 +299,21 @@ class Configuration(metaclass=DeclarativeValuesMetaclass):
     class Meta:
         loaders = None
         cache = False
+        negative_cache = False
+        thread_safe = False
+        instrument = False
+        on_lookup = None
 
-    def __init__(self, *, loaders=None, cache=False):
+    def __init__(
+        self,
+        *,
+        loaders=None,
+        cache=False,
+        negative_cache=False,
+        thread_safe=False,
+        instrument=False,
+        on_lookup=None,
+    ):
         _loaders = getattr(self.Meta, "loaders", None)
         if _loaders is None:
             _loaders = [Environment()]
@@ -143,13 +321,35 @@ class Configuration(metaclass=DeclarativeValuesMetaclass):
             _loaders = loaders
         self._loaders = _loaders
 
-        self._cache = any(
+        cache = cache or getattr(self.Meta, "cache", False)
+        if cache is True:
+            from .caches import ForeverCache
+
+            cache = ForeverCache()
+        self._cache = bool(cache)
+        self._cached_values = cache.clone() if cache else None
+
+        self._negative_cache = any(
             (
-                getattr(self.Meta, "cache", False),
-                cache,
+                getattr(self.Meta, "negative_cache", False),
+                negative_cache,
             )
         )
-        self._cached_values = {}
+        self._missing = set()
+        self.negative_cache_hits = 0
+
+        self._lock = allocate_lock()
+        self._flights = {}
+
+        on_lookup = on_lookup or getattr(self.Meta, "on_lookup", None)
+        self._stats = None
+        self._lookup = lookup
+        if on_lookup or any((getattr(self.Meta, "instrument", False), instrument)):
+            from .stats import LookupStats
+
+            self._stats = self._lookup = LookupStats(hook=on_lookup)
+        if any((getattr(self.Meta, "thread_safe", False), thread_safe)):
+            self._resolve = self._resolve_single_flight
 
     def __iter__(self):
         yield from self._declared_values.items()
@@ -180,16 +380,161 @@ class Configuration(metaclass=DeclarativeValuesMetaclass):
     def __getitem__(self, value):
         return self._declared_values[value].__get__(self, self.__class__)
 
-    def __call__(self, key, *, default=NOT_SET, cast=None):
-        if self._cache and key in self._cached_values:
-            return self._cached_values[key]
-        conf = getconf(key, default, cast=cast, loaders=self._loaders)
+    def __call__(self, key, *, default=NOT_SET, cast=None, ttl=None):
+        return self._resolve(key, default, resolve_cast(default, cast), ttl)
+
+    def _resolve(self, key, default, cast, ttl=None):
+        if self._cache:
+            try:
+                return self._cached_values[key]
+            except KeyError:
+                pass
+        if self._negative_cache:
+            conf = self._negative_lookup(key, default, cast)
+        else:
+            conf = self._lookup(key, default, cast, self._loaders)
         if self._cache:
-            self._cached_values[key] = conf
+            self._cached_values.set(key, conf, ttl)
         return conf
 
+    def _resolve_single_flight(self, key, default, cast, ttl=None):
+        # Concurrent misses on the same key wait for the first thread to
+        # resolve it, instead of all of them hitting the loaders.
+        with self._lock:
+            cache = self._cached_values
+            if self._cache:
+                try:
+                    return cache[key]
+                except KeyError:
+                    pass
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight((default, cast))
+
+        if not leader:
+            if flight.args == (default, cast):
+                return flight.wait()
+            # A different default or cast can give another value or error.
+            return Configuration._resolve(self, key, default, cast, ttl)
+
+        try:
+            if self._negative_cache:
+                conf = self._negative_lookup(key, default, cast)
+            else:
+                conf = self._lookup(key, default, cast, self._loaders)
+        except Exception as error:
+            with self._lock:
+                del self._flights[key]
+            flight.finish(error=error)
+            raise
+
+        with self._lock:
+            if self._cache:
+                # Set on the cache the lookup started with, so a value
+                # resolved across a reset() is not kept.
+                cache.set(key, conf, ttl)
+            del self._flights[key]
+        flight.finish(conf)
+        return conf
+
+    def _negative_lookup(self, key, default, cast):
+        # Values that no loader had fall back to their default straight away,
+        # until a loader reports that its source changed.
+        if key in self._missing:
+            if not any(loader.changed() for loader in self._loaders):
+                self.negative_cache_hits += 1
+                return fallback(key, default, cast)
+            self._missing = set()
+        return self._lookup(key, default, cast, self._loaders, self._missing)
+
+    def load_all(self):
+        """
+        Resolve every declared value asking each loader only once, instead of
+        probing every loader for every value.
+
+        :return: Dictionary with the casted values, in declaration order.
+        :rtype: dict
+        """
+        found = {}
+        remaining = list(self._declared_values)
+        for loader in self._loaders:
+            if not remaining:
+                break
+            found.update(loader.get_many(remaining))
+            remaining = [key for key in remaining if key not in found]
+
+        values = {}
+        ttls = {}
+        for value in self._declared_values.values():
+            key, default, cast, ttls[key] = value._plan or value.compile()
+            if key in found:
+                values[key] = cast(found[key])
+            else:
+                values[key] = fallback(key, default, cast)
+
+        if self._cache:
+            with self._lock:
+                for key, value in values.items():
+                    self._cached_values.set(key, value, ttls[key])
+
+        return values
+
+    def freeze(self):
+        """
+        Resolve every declared value once and return an immutable, hashable
+        and picklable snapshot of them, read with plain attribute access.
+        """
+        values = self.load_all()
+        keys = tuple(values)
+        return _frozen_class("Frozen" + self.__class__.__name__, keys)(*values.values())
+
+    def explain(self, key):
+        """
+        Tell where the value of a setting comes from: the loader that has it,
+        where it is defined and the definitions it shadows. Loaders of files
+        know the line and column of each setting if they ``track_locations``.
+
+        :param str key: Name of the value, or of any setting.
+        :return: The raw ``value``, or the default if no loader has it, the
+                 winning ``loader`` and its ``location``, and the list of
+                 ``shadowed`` sources.
+        :rtype: Explanation
+        """
+        default = NOT_SET
+        value = self._declared_values.get(key)
+        if value is not None:
+            key, default = value.key, value.default
+
+        sources = []
+        for loader in self._loaders:
+            sources += loader.sources(key)
+
+        if not sources:
+            return Explanation(key, default, None, None, [])
+        loader, value, location = sources[0]
+        return Explanation(key, value, loader, location, sources[1:])
+
+    def stats(self):
+        """
+        Timings and counters of the lookups made so far, if the configuration
+        is instrumented, or ``None`` otherwise.
+
+        :return: Dictionary with per ``keys`` and per ``loaders`` statistics.
+        :rtype: dict
+        """
+        if self._stats is None:
+            return None
+        stats = self._stats.as_dict()
+        stats["negative_cache_hits"] = self.negative_cache_hits
+        return stats
+
     def reset(self):
         """Anytime you want to pick up new values call this function."""
         for loader in self._loaders:
             loader.reset()
-        self._cached_values = {}
+        # Swap in fresh objects instead of clearing them, so threads still
+        # reading the old ones are not affected.
+        if self._cache:
+            self._cached_values = self._cached_values.clone()
+        self._missing = set()
@@ -1,9 +1,12 @@
 import os
-from configparser import ConfigParser, MissingSectionHeaderError, NoOptionError
-from glob import glob
+from _thread import allocate_lock
+from collections import namedtuple
+from stat import S_ISREG
+from time import monotonic, time
 
+from .caches import ParseCache
 from .exceptions import InvalidConfigurationFile, InvalidPath, MissingSettingsSection
-from .parsers import EnvFileParser
+from .parsers import EnvFileParser, IniSectionParser, MmapEnvFileParser, interpolate
 
 
 class NotSet(str):
@@ -20,18 +23,73 @@ class NotSet(str):
 
 NOT_SET = NotSet()
 
+#: Where a setting is defined. Line and column are ``None`` when unknown.
+Location = namedtuple("Location", "filename line column")
 
-class EnvPrefix:
+#: Files parsed by the loaders created with ``shared=True``.
+parse_cache = ParseCache()
+
+#: A definition of a setting: the loader that has it, its raw value and its
+#: ``Location``, if known.
+Source = namedtuple("Source", "loader value location")
+
+
+class MemoizedKeyfmt:
+    """
+    Remembers the names formatted by a ``keyfmt`` function, so looking up the
+    same setting again doesn't build the same string again. The function must
+    always return the same name for the same setting.
+    """
+
+    #: Maximum number of names to remember.
+    maxsize = 1024
+
+    def __init__(self, function):
+        """
+        :param function function: The ``keyfmt`` function to memoize.
+        """
+        self.function = function
+        self._keys = {}
+
+    def format(self, value):
+        return self.function(value)
+
+    def __call__(self, value):
+        try:
+            return self._keys[value]
+        except KeyError:
+            pass
+
+        key = self.format(value)
+        if len(self._keys) < self.maxsize:
+            self._keys[value] = key
+        return key
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.function)
+
+
+class EnvPrefix(MemoizedKeyfmt):
     """
     Since the environment is a global dictionary, it is a good practice to
     namespace your settings by using a unique prefix like ``MY_APP_``.
     """
 
     def __init__(self, prefix=""):
+        self._keys = {}
         self.prefix = prefix
 
-    def __call__(self, value):
-        return "{}{}".format(self.prefix, value.upper())
+    @property
+    def prefix(self):
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, prefix):
+        self._prefix = prefix
+        self._keys = {}
+
+    def format(self, value):
+        return "{}{}".format(self._prefix, value.upper())
 
     def __repr__(self):
         return '{}("{}")'.format(self.__class__.__name__, self.prefix)
@@ -52,6 +110,10 @@ def get_args(parser):
 
 
 class AbstractConfigurationLoader:
+    #: Whether loading the source blocks, e.g. on file I/O. Blocking loaders
+    #: are preloaded in an executor by ``AsyncConfiguration``.
+    blocking = False
+
     def __repr__(self):
         raise NotImplementedError()  # pragma: no cover
 
@@ -61,9 +123,73 @@ class AbstractConfigurationLoader:
     def __getitem__(self, item):
         raise NotImplementedError()  # pragma: no cover
 
+    def get_many(self, items):
+        """
+        Lookup several settings at once.
+
+        :param items: Names of the settings to lookup.
+        :return: Dictionary with the raw values of the settings that were found.
+        :rtype: dict
+        """
+        values = {}
+        for item in items:
+            try:
+                values[item] = self[item]
+            except KeyError:
+                continue
+        return values
+
     def check(self):
         return True
 
+    def preload(self):
+        """
+        Load the source right away, instead of waiting for the first lookup.
+        """
+        self.check()
+
+    async def apreload(self):
+        """
+        Async version of :py:meth:`preload`. Blocking loaders run it in the
+        default executor. Loaders for async sources should override it.
+        """
+        if not self.blocking:
+            return self.preload()
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.preload)
+
+    def locate(self, item):
+        """
+        Tell where a setting is defined.
+
+        :return: A ``Location``, or ``None`` if the source is not a file or
+                 doesn't have the setting.
+        """
+        return None
+
+    def sources(self, item):
+        """
+        Every definition of a setting in this loader, the one used first.
+
+        :return: List of ``Source``.
+        :rtype: list
+        """
+        try:
+            value = self[item]
+        except KeyError:
+            return []
+        return [Source(self, value, self.locate(item))]
+
+    def changed(self):
+        """
+        Tell whether the source changed since it was loaded, so values that
+        were missing from it can be looked up again.
+        """
+        return False
+
     def reset(self):
         pass
 
@@ -92,65 +218,477 @@ class CommandLine(AbstractConfigurationLoader):
     def __getitem__(self, item):
         return self.configs[item]
 
+    def get_many(self, items):
+        configs = self.configs
+        return {item: configs[item] for item in items if item in configs}
+
+
+class FileLoader(AbstractConfigurationLoader):
+    """
+    Base class of loaders that parse a file. They find out whether the file
+    exists or changed with a ``stat`` call, done at most once every
+    ``revalidate`` seconds, and parse it again when it changed.
+    """
+
+    blocking = True
+
+    def __init__(self, filename, revalidate=0):
+        """
+        :param str filename: Path to the file.
+        :param float revalidate: Seconds between checks of the file, ``0`` to
+                                 check it on every lookup or ``None`` to
+                                 stop checking it once it loaded.
+        """
+        self.filename = filename
+        self.revalidate = revalidate
+        self._stat = None
+        self._stat_time = None
+        self._loaded_stat = None
+        #: The stat of the file as of the last ``check()``, loaded or not.
+        self._checked_stat = None
+
+    def _parse(self, reload=False):
+        """
+        Parse the file, if it wasn't yet or ``reload`` is set. The parsed
+        data is replaced only once the file was read, so lookups made
+        meanwhile see the previous version.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def _load_shared(self, kind):
+        """
+        Get the parsed file from ``parse_cache``, or from the ``ParseCache``
+        given as ``shared``.
+        """
+        cache = parse_cache if self.shared is True else self.shared
+        return cache.get(self.filename, kind, self._load, self._stat)
+
+    def _file_stat(self):
+        """
+        :return: The mtime, size, inode and device of the file, or ``None``
+                 if it isn't a file, as of the last check.
+        """
+        if self._stat_time is not None:
+            if self.revalidate is None:
+                # Until it loads, the file might still be created or fixed.
+                if self._loaded_stat is not None:
+                    return self._stat
+            elif self.revalidate and monotonic() - self._stat_time < self.revalidate:
+                return self._stat
+
+        try:
+            stat = os.stat(self.filename)
+        except (OSError, ValueError):
+            self._stat = None
+        else:
+            if S_ISREG(stat.st_mode):
+                self._stat = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    stat.st_ino,
+                    stat.st_dev,
+                )
+            else:
+                self._stat = None
+        self._stat_time = monotonic()
+        return self._stat
+
+    def check(self):
+        stat = self._checked_stat = self._file_stat()
+        if stat is None:
+            return False
+
+        try:
+            self._parse(reload=stat != self._loaded_stat)
+        except (FileNotFoundError, InvalidConfigurationFile, MissingSettingsSection):
+            self._loaded_stat = None
+            return False
+        self._loaded_stat = stat
+
+        return super().check()
+
+    def changed(self):
+        # Files missing or invalid when checked are changed once they are
+        # created or modified, so they get checked again.
+        return self._stat_time is not None and self._file_stat() != self._checked_stat
+
+    def reset(self):
+        self._stat_time = None
+        self._loaded_stat = None
+        self._checked_stat = None
+
 
-class IniFile(AbstractConfigurationLoader):
-    def __init__(self, filename, section="settings", keyfmt=lambda x: x):
+class IniFile(FileLoader):
+    def __init__(
+        self,
+        filename,
+        section="settings",
+        keyfmt=lambda x: x,
+        track_locations=False,
+        shared=False,
+        revalidate=None,
+        fast=False,
+        interpolation=False,
+    ):
         """
         :param str filename: Path to the ``.ini/.cfg`` file.
         :param str section: Section name inside the config file.
         :param function keyfmt: A function to pre-format variable names.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined, for ``locate()``.
+        :param bool shared: Share the parsed file with other loaders through
+                            ``parse_cache``, or the ``ParseCache`` given,
+                            until the file changes.
+        :param float revalidate: Seconds between checks of the file, ``0`` to
+                                 check it on every lookup or ``None`` to
+                                 stop checking it once it loaded.
+        :param bool fast: Read only ``section`` into a dictionary with
+                          ``IniSectionParser``, instead of using
+                          ``ConfigParser``.
+        :param bool interpolation: Replace ``%(name)s`` references in values
+                                   in ``fast`` mode, which ``ConfigParser``
+                                   always does.
         """
-        self.filename = filename
+        super().__init__(filename, revalidate)
         self.section = section
         self.keyfmt = keyfmt
-        self.parser = ConfigParser(allow_no_value=True)
+        self.track_locations = track_locations
+        self.shared = shared
+        self.fast = fast
+        self.interpolation = interpolation
+        self.parser = None
+        #: Options of the section, in ``fast`` mode.
+        self.values = None
+        self.locations = None
         self._initialized = False
 
     def __repr__(self):
         return '{}("{}")'.format(self.__class__.__name__, self.filename)
 
-    def _parse(self):
-        if self._initialized:
-            return
+    def _load(self):
+        """
+        Parse the file.
+
+        :return: The parser, or the options of the section in ``fast`` mode,
+                 and the locations of the options, if tracked.
+        """
+        if self.fast:
+            with open(self.filename) as inifile:
+                reader = IniSectionParser(inifile, self.section, self.track_locations)
+                try:
+                    return reader.parse(), reader.locations
+                except UnicodeDecodeError:
+                    raise InvalidConfigurationFile()
 
+        from configparser import ConfigParser, MissingSectionHeaderError
+
+        # Parse into a new parser and publish it when done, so concurrent
+        # lookups never see a half read file.
+        parser = ConfigParser(allow_no_value=True)
+        tracker = None
         with open(self.filename) as inifile:
+            lines = inifile
+            if self.track_locations:
+                lines = tracker = _LineTracker(inifile, parser)
             try:
-                self.parser.read_file(inifile)
+                parser.read_file(lines, source=self.filename)
             except (UnicodeDecodeError, MissingSectionHeaderError):
                 raise InvalidConfigurationFile()
+            finally:
+                if tracker is not None:
+                    del parser.optionxform
+
+        return parser, tracker and tracker.locations
+
+    def _parse(self, reload=False):
+        if self._initialized and not reload:
+            return
 
-        if not self.parser.has_section(self.section):
+        if self.shared:
+            kind = (IniFile, self.track_locations, self.fast and self.section)
+            parsed, locations = self._load_shared(kind)
+        else:
+            parsed, locations = self._load()
+
+        if self.fast:
+            missing = parsed is None
+        else:
+            missing = not parsed.has_section(self.section)
+        if missing:
             raise MissingSettingsSection(
                 "Missing [{}] section in {}".format(self.section, self.filename)
             )
 
+        if self.fast:
+            self.values = parsed
+        else:
+            self.parser = parsed
+        self.locations = locations
         self._initialized = True
 
-    def check(self):
-        try:
-            self._parse()
-        except (FileNotFoundError, InvalidConfigurationFile, MissingSettingsSection):
-            return False
-
-        return super().check()
+    def _get(self, option):
+        # Lookup in fast mode.
+        option = option.lower()
+        value = self.values[option]
+        if self.interpolation and value:
+            value = interpolate(self.values, self.section, option, value)
+        return value
 
     def __contains__(self, item):
         if not self.check():
             return False
 
+        if self.fast:
+            return self.keyfmt(item).lower() in self.values
         return self.parser.has_option(self.section, self.keyfmt(item))
 
     def __getitem__(self, item):
         if not self.check():
             raise KeyError("{!r}".format(item))
 
-        try:
-            return self.parser.get(self.section, self.keyfmt(item))
-        except NoOptionError:
+        if self.fast:
+            try:
+                return self._get(self.keyfmt(item))
+            except KeyError:
+                raise KeyError("{!r}".format(item))
+
+        value = self.parser.get(self.section, self.keyfmt(item), fallback=NOT_SET)
+        if value is NOT_SET:
             raise KeyError("{!r}".format(item))
+        return value
+
+    def get_many(self, items):
+        if not self.check():
+            return {}
+
+        values = {}
+        for item in items:
+            option = self.keyfmt(item)
+            if self.fast:
+                if option.lower() in self.values:
+                    values[item] = self._get(option)
+            elif self.parser.has_option(self.section, option):
+                values[item] = self.parser.get(self.section, option)
+        return values
+
+    def locate(self, item):
+        if item not in self:
+            return None
+        if not self.locations:
+            return Location(self.filename, None, None)
+
+        option = self.keyfmt(item).lower()
+        for section in (self.section, IniSectionParser.DEFAULT_SECTION):
+            position = self.locations.get(section, {}).get(option)
+            if position:
+                return Location(self.filename, *position)
+        return Location(self.filename, None, None)
 
     def reset(self):
         self._initialized = False
+        super().reset()
+
+
+class _LineTracker:
+    """
+    Feeds a file to a ``ConfigParser`` keeping count of the lines, so it can
+    record where each option is defined while the file is read.
+    """
+
+    def __init__(self, lines, parser):
+        self._lines = lines
+        self._parser = parser
+        self.line = ""
+        self.lineno = 0
+        self.section = None
+        #: Section names to option names to their ``(line, column)``.
+        self.locations = {}
+        parser.optionxform = self.optionxform
+
+    def __iter__(self):
+        header = self._parser.SECTCRE.match
+        for line in self._lines:
+            self.line = line
+            self.lineno += 1
+            match = header(line.strip())
+            if match:
+                self.section = match.group("header")
+            yield line
+
+    def optionxform(self, optionstr):
+        # Called by the parser for each option, while on its line.
+        option = type(self._parser).optionxform(self._parser, optionstr)
+        column = len(self.line) - len(self.line.lstrip()) + 1
+        self.locations.setdefault(self.section, {})[option] = (self.lineno, column)
+        return option
+
+
+class LayeredIniFile(AbstractConfigurationLoader):
+    """
+    Reads a section from several ``.ini/.cfg`` files, the first file having
+    precedence over the next ones, like a list of ``IniFile`` loaders would.
+    Their options are merged into a single dictionary, so a lookup costs the
+    same whatever the number of files.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        filenames,
+        section="settings",
+        keyfmt=lambda x: x,
+        track_locations=False,
+        shared=False,
+        revalidate=None,
+        interpolation=False,
+    ):
+        """
+        :param list filenames: Paths to the ``.ini/.cfg`` files, from the one
+                               with the highest precedence to the lowest.
+        :param str section: Section name inside the config files.
+        :param function keyfmt: A function to pre-format variable names.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined, for ``locate()``.
+        :param bool shared: Share the parsed files with other loaders through
+                            ``parse_cache``, until they change.
+        :param float revalidate: Seconds between checks of the files, ``0`` to
+                                 check them on every lookup or ``None`` to
+                                 stop checking them once they all loaded.
+        :param bool interpolation: Replace ``%(name)s`` references in values,
+                                   looking them up in the merged options.
+        """
+        self.filenames = list(filenames)
+        self.section = section
+        self.keyfmt = keyfmt
+        self.revalidate = revalidate
+        self.interpolation = interpolation
+        #: One ``IniFile`` per file, which only parses it again when it changes.
+        self.layers = [
+            IniFile(
+                filename,
+                section=section,
+                keyfmt=keyfmt,
+                track_locations=track_locations,
+                shared=shared,
+                revalidate=0,
+                fast=True,
+                interpolation=interpolation,
+            )
+            for filename in self.filenames
+        ]
+        #: Merged options of the section, or ``None`` if no file has it.
+        self.values = None
+        self._layer_values = None
+        self._check_time = None
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.filenames)
+
+    def _due(self):
+        if self._check_time is None:
+            return True
+        if self.revalidate is None:
+            # Like ``IniFile``, files are checked until they load.
+            return any(values is None for values in self._layer_values)
+        return monotonic() - self._check_time >= self.revalidate
+
+    def _merge(self):
+        self._check_time = monotonic()
+        layer_values = [
+            layer.values if layer.check() else None for layer in self.layers
+        ]
+        if self._layer_values is not None and all(
+            new is old for new, old in zip(layer_values, self._layer_values)
+        ):
+            return
+
+        loaded = [values for values in layer_values if values is not None]
+        merged = {} if loaded else None
+        for values in reversed(loaded):
+            merged.update(values)
+        self.values = merged
+        self._layer_values = layer_values
+
+    def check(self):
+        if self._due():
+            self._merge()
+        return self.values is not None
+
+    def _get(self, option):
+        option = option.lower()
+        values = self.values
+        value = values[option]
+        if self.interpolation and value:
+            value = interpolate(values, self.section, option, value)
+        return value
+
+    def __contains__(self, item):
+        if not self.check():
+            return False
+        return self.keyfmt(item).lower() in self.values
+
+    def __getitem__(self, item):
+        if not self.check():
+            raise KeyError("{!r}".format(item))
+
+        try:
+            return self._get(self.keyfmt(item))
+        except KeyError:
+            raise KeyError("{!r}".format(item))
+
+    def get_many(self, items):
+        if not self.check():
+            return {}
+
+        values = {}
+        for item in items:
+            option = self.keyfmt(item)
+            if option.lower() in self.values:
+                values[item] = self._get(option)
+        return values
+
+    def _layers_with(self, item):
+        option = self.keyfmt(item).lower()
+        for layer, values in zip(self.layers, self._layer_values):
+            if values is not None and option in values:
+                yield layer
+
+    def locate(self, item):
+        if item not in self:
+            return None
+        for layer in self._layers_with(item):
+            return layer.locate(item)
+
+    def sources(self, item):
+        if item not in self:
+            return []
+        sources = []
+        for layer in self._layers_with(item):
+            sources += layer.sources(item)
+        if sources:
+            # The value used is interpolated with the merged options.
+            sources[0] = sources[0]._replace(value=self[item])
+        return sources
+
+    def changed(self):
+        return (
+            self._layer_values is not None
+            and self._due()
+            and any(layer.changed() for layer in self.layers)
+        )
+
+    def reset(self):
+        for layer in self.layers:
+            layer.reset()
+        self.values = None
+        self._layer_values = None
+        self._check_time = None
+
+
+def _raw_environ():
+    # What ``os.environ`` wraps, which can be compared without decoding it.
+    return getattr(os.environ, "_data", os.environ)
 
 
 class Environment(AbstractConfigurationLoader):
@@ -158,78 +696,313 @@ class Environment(AbstractConfigurationLoader):
     Get's configuration from the environment, by inspecting ``os.environ``.
     """
 
-    def __init__(self, keyfmt=EnvPrefix()):
+    def __init__(self, keyfmt=EnvPrefix(), snapshot=False, revalidate=None):
         """
         :param function keyfmt: A function to pre-format variable names.
+        :param bool snapshot: Copy the variables into a dictionary on the
+                              first lookup, keeping only those with the
+                              prefix of an ``EnvPrefix`` ``keyfmt``, and
+                              lookup there instead of in ``os.environ``.
+        :param float revalidate: Seconds between checks of whether the
+                                 environment changed since the snapshot,
+                                 ``0`` to check on every lookup or ``None``
+                                 to not check until ``reset()``.
         """
         self.keyfmt = keyfmt
+        self.snapshot = snapshot
+        self.revalidate = revalidate
+        #: Variables of the snapshot, by setting name if ``keyfmt`` is an
+        #: ``EnvPrefix``.
+        self.values = None
+        self._key = None
+        self._environ = None
+        self._check_time = None
 
     def __repr__(self):
         return "{}(keyfmt={})".format(self.__class__.__name__, self.keyfmt)
 
+    def _take_snapshot(self):
+        # Copied first, so changes made while reading it are found later on.
+        environ = dict(_raw_environ())
+        keyfmt = self.keyfmt
+        if type(keyfmt) is EnvPrefix:
+            prefix = keyfmt.prefix
+            start = len(prefix)
+            values = {
+                name[start:]: value
+                for name, value in os.environ.items()
+                if name.startswith(prefix)
+            }
+            self._key = str.upper
+        else:
+            values = dict(os.environ)
+            self._key = keyfmt
+        self._environ = environ
+        self._check_time = monotonic()
+        self.values = values
+        return values
+
+    def _snapshot(self):
+        values = self.values
+        if values is None:
+            return self._take_snapshot()
+        if (
+            self.revalidate is not None
+            and monotonic() - self._check_time >= self.revalidate
+        ):
+            self._check_time = monotonic()
+            if self.changed():
+                return self._take_snapshot()
+        return values
+
+    def preload(self):
+        if self.snapshot:
+            self._snapshot()
+
     def __contains__(self, item):
+        if self.snapshot:
+            values = self._snapshot()
+            return self._key(item) in values
         return self.keyfmt(item) in os.environ
 
     def __getitem__(self, item):
+        if self.snapshot:
+            try:
+                return self._snapshot()[self._key(item)]
+            except KeyError:
+                raise KeyError("{!r}".format(item))
+
         # Uses `os.environ` because it raises an exception if the environmental
         # variable does not exist, whilst `os.getenv` doesn't.
         return os.environ[self.keyfmt(item)]
 
+    def get_many(self, items):
+        if self.snapshot:
+            environ = self._snapshot()
+            keyfmt = self._key
+        else:
+            # A single pass over ``os.environ`` is cheaper than decoding and
+            # failing one lookup at a time.
+            environ = dict(os.environ)
+            keyfmt = self.keyfmt
+        values = {}
+        for item in items:
+            key = keyfmt(item)
+            if key in environ:
+                values[item] = environ[key]
+        return values
+
+    def changed(self):
+        """
+        Tell whether the environment changed since the snapshot, comparing
+        the variables without decoding them. With ``revalidate`` set to
+        ``None`` lookups keep reading the snapshot until ``reset()``, so it
+        never changes.
+        """
+        if self._environ is None or self.revalidate is None:
+            return False
+        return _raw_environ() != self._environ
 
-class EnvFile(AbstractConfigurationLoader):
-    def __init__(self, filename=".env", keyfmt=EnvPrefix()):
+    def reset(self):
+        self.values = None
+        self._environ = None
+
+
+class EnvFile(FileLoader):
+    def __init__(
+        self,
+        filename=".env",
+        keyfmt=EnvPrefix(),
+        parser=EnvFileParser,
+        lazy=False,
+        mmap=False,
+        track_locations=False,
+        shared=False,
+        revalidate=0,
+    ):
         """
         :param str filename: Path to the ``.env`` file.
         :param function keyfmt: A function to pre-format variable names.
+        :param parser: Parser class, ``FastEnvFileParser`` is recommended
+                       for big files.
+        :param bool lazy: Parse the file only until the setting looked up is
+                          found. If a setting is defined more than once, the
+                          first definition is used instead of the last one.
+        :param bool mmap: Map the file in memory and decode values only when
+                          they are looked up, with ``MmapEnvFileParser``. The
+                          ``parser`` and ``lazy`` options are ignored.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined, for ``locate()``.
+        :param bool shared: Share the parsed file with other loaders through
+                            ``parse_cache``, or the ``ParseCache`` given,
+                            until the file changes. Ignored in ``lazy`` mode.
+        :param float revalidate: Seconds between checks of the file, ``0`` to
+                                 check it on every lookup or ``None`` to
+                                 stop checking it once it loaded.
         """
-        self.filename = filename
+        super().__init__(filename, revalidate)
         self.keyfmt = keyfmt
+        self.parser = parser
+        self.lazy = lazy
+        self.mmap = mmap
+        self.track_locations = track_locations
+        self.shared = shared
         self.configs = None
+        self.locations = None
+        self._pending = None
+        self._lock = allocate_lock()
 
     def __repr__(self):
         return '{}("{}")'.format(self.__class__.__name__, self.filename)
 
-    def _parse(self):
-        if self.configs is not None:
-            return
+    def _open_parser(self, envfile):
+        if self.track_locations:
+            return self.parser(envfile, track_locations=True)
+        return self.parser(envfile)
 
-        self.configs = {}
+    def _read(self, locations):
         with open(self.filename) as envfile:
-            self.configs.update(EnvFileParser(envfile).parse_config())
+            parser = self._open_parser(envfile)
+            for key, value in parser.parse_config():
+                if locations is not None and key not in locations:
+                    locations[key] = parser.locations[key]
+                yield key, value
 
-    def check(self):
-        if not os.path.isfile(self.filename):
-            return False
+    def _load(self):
+        """
+        Parse the whole file.
 
-        try:
-            self._parse()
-        except FileNotFoundError:
-            return False
+        :return: The settings and their locations, if tracked.
+        """
+        if self.mmap:
+            with open(self.filename, "rb") as envfile:
+                parser = MmapEnvFileParser(
+                    envfile, track_locations=self.track_locations
+                )
+                return parser.parse(), parser.locations
+
+        configs = {}
+        with open(self.filename) as envfile:
+            parser = self._open_parser(envfile)
+            configs.update(parser.parse_config())
+        return configs, parser.locations if self.track_locations else None
 
-        return super().check()
+    def _parse(self, reload=False):
+        if self.configs is not None and not reload:
+            return
+
+        if self.lazy and not self.mmap:
+            with self._lock:
+                if self._pending is not None:
+                    self._pending.close()
+                self.locations = {} if self.track_locations else None
+                self._pending = self._read(self.locations)
+                self.configs = {}
+            return
+
+        if self.shared:
+            kind = (EnvFile, self.parser, self.mmap, self.track_locations)
+            configs, locations = self._load_shared(kind)
+        else:
+            configs, locations = self._load()
+        self.locations = locations
+        self.configs = configs
+
+    def _resume(self, key):
+        """
+        Keep parsing a lazy file until ``key`` is found or the file ends.
+        """
+        with self._lock:
+            configs = self.configs
+            if key not in configs and self._pending is not None:
+                for found, value in self._pending:
+                    configs.setdefault(found, value)
+                    if found == key:
+                        break
+                else:
+                    self._pending = None
+            return configs[key]
 
     def __contains__(self, item):
-        if not self.check():
+        try:
+            self[item]
+        except KeyError:
             return False
-
-        return self.keyfmt(item) in self.configs
+        return True
 
     def __getitem__(self, item):
         if not self.check():
             raise KeyError("{!r}".format(item))
 
-        return self.configs[self.keyfmt(item)]
+        key = self.keyfmt(item)
+        try:
+            return self.configs[key]
+        except KeyError:
+            if self._pending is None:
+                raise
+        return self._resume(key)
+
+    def get_many(self, items):
+        if not self.check():
+            return {}
+
+        values = {}
+        for item in items:
+            key = self.keyfmt(item)
+            if key in self.configs:
+                values[item] = self.configs[key]
+            elif self._pending is not None:
+                try:
+                    values[item] = self._resume(key)
+                except KeyError:
+                    continue
+        return values
+
+    def locate(self, item):
+        if item not in self:
+            return None
+
+        position = None
+        if self.locations:
+            position = self.locations.get(self.keyfmt(item))
+        return Location(self.filename, *(position or (None, None)))
 
     def reset(self):
-        self.configs = None
+        with self._lock:
+            if self._pending is not None:
+                self._pending.close()
+            self._pending = None
+            self.configs = None
+        super().reset()
+
+
+def _check_quietly(loader):
+    try:
+        loader.check()
+    except Exception:
+        # Raised again when a lookup reaches the file.
+        pass
 
 
 class RecursiveSearch(AbstractConfigurationLoader):
+    blocking = True
+    #: Format of the persisted index.
+    INDEX_VERSION = 1
+    #: Files and directories modified less than these seconds ago are not
+    #: persisted, since they could change without changing their mtime.
+    RACY_SECONDS = 1
+
     def __init__(
         self,
         starting_path=None,
         filetypes=((".env", EnvFile), (("*.ini", "*.cfg"), IniFile)),
         root_path="/",
+        track_locations=False,
+        shared=False,
+        revalidate=0,
+        lazy=False,
+        persist=False,
+        workers=None,
     ):
         """
         :param str starting_path: The path to begin looking for configuration files.
@@ -238,6 +1011,22 @@ class RecursiveSearch(AbstractConfigurationLoader):
                                 ``(('*.env', EnvFile), (('*.ini', *.cfg',), IniFile)``
         :param str root_path: Configuration lookup will stop at the given path. Defaults to
                               the current user directory
+        :param bool track_locations: Make the loaders of the files found record
+                                     where each setting is defined.
+        :param bool shared: Make the loaders of the files found share them
+                            through ``parse_cache``.
+        :param float revalidate: Seconds between checks of the files for
+                                 changes, ``0`` to check them on every lookup
+                                 or ``None`` to not check them until
+                                 ``reset()``.
+        :param bool lazy: Walk up to the parent directories only when the
+                          setting looked up wasn't found yet.
+        :param persist: Keep the files found, and their parsed settings, in an
+                        index under ``$XDG_CACHE_HOME/classyconf``, or in the
+                        directory given, for the next processes to reuse.
+        :param int workers: List the directories and parse the files found on
+                            a pool of this many threads, when they are found
+                            instead of when a lookup reaches them.
         """
         self.root_path = os.path.realpath(root_path)
         self._starting_path = self.root_path
@@ -246,7 +1035,26 @@ class RecursiveSearch(AbstractConfigurationLoader):
             self.starting_path = starting_path
 
         self.filetypes = filetypes
+        self.track_locations = track_locations
+        self.shared = shared
+        self.revalidate = revalidate
+        self.lazy = lazy
+        self.persist = persist
+        self.workers = workers
+        self._found = None
+        #: Directories left to walk, in ``lazy`` mode.
+        self._paths = None
+        self._lock = allocate_lock()
+        self._check_time = None
         self._config_files = None
+        #: Names looked up to the position of the file with their value, and
+        #: the value, or ``NOT_SET``.
+        self._index = {}
+        #: Parsed files and matches of each directory, with ``persist``.
+        self._persisted = None
+        self._listings = None
+        self._listings_changed = False
+        self._saved_misses = 0
 
     @property
     def starting_path(self):
@@ -263,47 +1071,298 @@ class RecursiveSearch(AbstractConfigurationLoader):
         self._starting_path = path
 
     @staticmethod
-    def get_filenames(path, patterns):
-        filenames = []
+    def list_files(path):
+        """
+        :param str path: Directory to list.
+        :return: Names of the files in the directory, or an empty list if it
+                 isn't a directory.
+        :rtype: list
+        """
+        try:
+            with os.scandir(path) as entries:
+                return [entry.name for entry in entries if entry.is_file()]
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def get_filenames(path, patterns, names=None):
+        """
+        :param str path: Directory to look into.
+        :param patterns: A glob pattern, or a tuple of them, for file names.
+        :param list names: Names of the files in the directory, if it was
+                           already listed.
+        :return: Paths of the files matching the patterns, like ``glob``.
+        :rtype: list
+        """
+        from fnmatch import filter
+
+        if names is None:
+            names = RecursiveSearch.list_files(path)
         if type(patterns) is str:
             patterns = (patterns,)
 
+        filenames = []
+        visible = None
         for pattern in patterns:
-            filenames += glob(os.path.join(path, pattern))
+            if pattern.startswith("."):
+                matches = filter(names, pattern)
+            else:
+                # Like glob, wildcards don't match hidden files.
+                if visible is None:
+                    visible = [name for name in names if not name.startswith(".")]
+                matches = filter(visible, pattern)
+            filenames += [os.path.join(path, name) for name in matches]
         return filenames
 
+    def _match_files(self, path):
+        """
+        :return: The position in ``filetypes`` and the path of each file of
+                 the directory matching them.
+        :rtype: list
+        """
+        matches = []
+        names = self.list_files(path)
+        if names:
+            for position, (patterns, _) in enumerate(self.filetypes):
+                for filename in self.get_filenames(path, patterns, names):
+                    matches.append((position, filename))
+        return matches
+
     def _scan_path(self, path):
-        config_files = []
+        if self.persist:
+            matches = self._persisted_matches(path)
+        else:
+            matches = self._match_files(path)
 
-        for patterns, Loader in self.filetypes:
-            for filename in self.get_filenames(path, patterns):
-                try:
-                    loader = Loader(filename=filename)
-                    if not loader.check():
-                        continue
-                    config_files.append(loader)
-                except InvalidConfigurationFile:
-                    continue
+        # Files are parsed by their loaders when a lookup first reaches them.
+        config_files = []
+        options = self._loader_options()
+        for position, filename in matches:
+            Loader = self.filetypes[position][1]
+            try:
+                loader = Loader(filename=filename, **options)
+            except InvalidConfigurationFile:
+                continue
+            if isinstance(loader, FileLoader):
+                # Lookups decide when to check the files, with ``revalidate``.
+                loader.revalidate = None if self.revalidate is None else 0
+            config_files.append(loader)
 
         return config_files
 
-    def _discover(self):
-        self._config_files = []
+    def _loader_options(self):
+        # Only given when set, custom loaders might not support them.
+        options = {}
+        if self.track_locations:
+            options["track_locations"] = True
+        if self.persist:
+            options["shared"] = self._persisted_files()
+        elif self.shared:
+            options["shared"] = True
+        return options
+
+    def _index_filename(self):
+        directory = self.persist
+        if directory is True:
+            cache_home = os.environ.get("XDG_CACHE_HOME")
+            if not cache_home:
+                cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+            directory = os.path.join(cache_home, "classyconf")
+
+        from hashlib import sha1
+
+        filetypes = [
+            (patterns, Loader.__module__, Loader.__qualname__)
+            for patterns, Loader in self.filetypes
+        ]
+        key = repr((self.starting_path, self.root_path, filetypes))
+        return os.path.join(directory, sha1(key.encode()).hexdigest() + ".index")
+
+    def _persisted_files(self):
+        """
+        Load the index kept by a previous process, if any.
+
+        :return: The ``ParseCache`` of the files found.
+        """
+        if self._persisted is not None:
+            return self._persisted
+
+        import pickle
+
+        # Paths found are in real directories already.
+        files = ParseCache(maxsize=256, realpath=False)
+        try:
+            with open(self._index_filename(), "rb") as index:
+                # Only trust indexes written by the same user.
+                uid = os.fstat(index.fileno()).st_uid
+                if hasattr(os, "getuid") and uid != os.getuid():
+                    raise PermissionError(self._index_filename())
+                version, listings = pickle.load(index)
+                if version != self.INDEX_VERSION:
+                    raise ValueError(version)
+                files.load(index)
+        except Exception:
+            # A missing, outdated or corrupt index is just rebuilt.
+            listings = {}
+
+        self._listings = listings
+        self._listings_changed = False
+        self._saved_misses = files.misses
+        self._persisted = files
+        return files
+
+    def _persisted_matches(self, path):
+        """
+        Match the files of a directory, or reuse the matches in the index if
+        the directory didn't change since.
+        """
+        self._persisted_files()
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            signature = ()
+        else:
+            signature = (stat.st_mtime_ns, stat.st_ino, stat.st_dev)
+            if time() - stat.st_mtime < self.RACY_SECONDS:
+                # Could change again without changing its mtime.
+                signature = None
+
+        listing = self._listings.get(path)
+        if listing is not None and signature is not None and listing[0] == signature:
+            return listing[1]
+
+        matches = self._match_files(path)
+        if signature is None:
+            self._listings.pop(path, None)
+        else:
+            self._listings[path] = (signature, matches)
+        self._listings_changed = True
+        return matches
+
+    def _save_index(self):
+        """
+        Write the index, if files were listed or parsed since it was read.
+        """
+        files = self._persisted
+        if files is None:
+            return
+        misses = files.misses
+        if not self._listings_changed and misses == self._saved_misses:
+            return
+
+        import pickle
+        from tempfile import mkstemp
+
+        filename = self._index_filename()
+        try:
+            os.makedirs(os.path.dirname(filename), mode=0o700, exist_ok=True)
+            fd, temporary = mkstemp(dir=os.path.dirname(filename))
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as index:
+                pickle.dump((self.INDEX_VERSION, dict(self._listings)), index)
+                files.dump(index, racy=self.RACY_SECONDS)
+            os.replace(temporary, filename)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            return
+        self._listings_changed = False
+        self._saved_misses = misses
 
+    def _walk(self):
         path = self.starting_path
         while True:
-            if os.path.isdir(path):
-                self._config_files += self._scan_path(path)
+            yield path
 
             if path == self.root_path:
                 break
 
             path = os.path.dirname(path)
 
+    def _discover(self):
+        if self.lazy:
+            self._paths = self._walk()
+            self._found = []
+        else:
+            if self.persist:
+                # Load the index before the threads of the pool share it.
+                self._persisted_files()
+            found = []
+            for config_files in self._map(self._scan_path, list(self._walk())):
+                found += config_files
+            self._prefetch(found)
+            self._found = found
+        self._check_time = monotonic()
+
+    def _map(self, function, items):
+        """
+        :return: The results of ``function`` for each item, in order, got on
+                 a pool of ``workers`` threads if set.
+        :rtype: list
+        """
+        if not self.workers or len(items) < 2:
+            return [function(item) for item in items]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(function, items))
+
+    def _prefetch(self, config_files):
+        """
+        Parse the files found on the thread pool, if ``workers`` is set.
+        """
+        if self.workers:
+            self._map(_check_quietly, config_files)
+
+    def _found_files(self):
+        """
+        :return: Loaders of all the files found so far, even if they are not
+                 valid.
+        :rtype: list
+        """
+        if self._found is None:
+            self._discover()
+
+        return self._found
+
+    def _iter_files(self):
+        """
+        Loaders of all the files found, walking up the directories left in
+        ``lazy`` mode only when the ones already found were exhausted.
+        """
+        found = self._found_files()
+        position = 0
+        while True:
+            while position < len(found):
+                yield found[position]
+                position += 1
+
+            with self._lock:
+                if position < len(found):
+                    continue  # Another thread walked meanwhile.
+                path = next(self._paths, None) if self._paths else None
+                if path is None:
+                    self._paths = None
+                    return
+                config_files = self._scan_path(path)
+                self._prefetch(config_files)
+                found += config_files
+
     @property
     def config_files(self):
+        """
+        Loaders of the valid files found, which parses all of them.
+        """
         if self._config_files is None:
-            self._discover()
+            self._config_files = [
+                loader for loader in self._iter_files() if loader.check()
+            ]
+            self._save_index()
 
         return self._config_files
 
@@ -312,23 +1371,109 @@ class RecursiveSearch(AbstractConfigurationLoader):
             self.__class__.__name__, self.starting_path
         )
 
-    def __contains__(self, item):
-        for config_file in self.config_files:
-            if item in config_file:
-                return True
-        return False
+    def preload(self):
+        self.config_files
 
-    def __getitem__(self, item):
-        for config_file in self.config_files:
+    def _indexed(self, item):
+        """
+        :return: The ``(position, value)`` entry of ``item`` in the index, or
+                 ``None`` if it isn't indexed or a file it depends on changed.
+        """
+        entry = self._index.get(item)
+        if entry is None:
+            return None
+
+        found = self._found_files()
+        if not self.revalidate:
+            if self.revalidate is None:
+                return entry
+            # Only the files up to the one with the value can change it.
+            last = entry[0]
+        elif monotonic() - self._check_time < self.revalidate:
+            return entry
+        else:
+            last = len(found) - 1
+            self._check_time = monotonic()
+
+        for position in range(min(last + 1, len(found))):
+            if found[position].changed():
+                # Values from the files before the changed one are still good.
+                index = self._index
+                self._index = {k: e for k, e in index.items() if e[0] < position}
+                return entry if entry[0] < position else None
+        return entry
+
+    def _lookup(self, item):
+        entry = self._indexed(item)
+        if entry is not None:
+            return entry
+
+        for position, config_file in enumerate(self._iter_files()):
             try:
-                return config_file[item]
+                entry = (position, config_file[item])
+                break
             except KeyError:
                 continue
         else:
+            entry = (len(self._found_files()) - 1, NOT_SET)
+        self._index[item] = entry
+        self._save_index()
+        return entry
+
+    def __contains__(self, item):
+        return self._lookup(item)[1] is not NOT_SET
+
+    def __getitem__(self, item):
+        value = self._lookup(item)[1]
+        if value is NOT_SET:
             raise KeyError("{!r}".format(item))
+        return value
+
+    def get_many(self, items):
+        values = {}
+        remaining = []
+        for item in items:
+            entry = self._indexed(item)
+            if entry is None:
+                remaining.append(item)
+            elif entry[1] is not NOT_SET:
+                values[item] = entry[1]
+        if not remaining:
+            return values
+
+        index = self._index
+        for position, config_file in enumerate(self._iter_files()):
+            for item, value in config_file.get_many(remaining).items():
+                values[item] = value
+                index[item] = (position, value)
+            remaining = [item for item in remaining if item not in values]
+            if not remaining:
+                break
+        for item in remaining:
+            index[item] = (len(self._found_files()) - 1, NOT_SET)
+        self._save_index()
+        return values
+
+    def locate(self, item):
+        position, value = self._lookup(item)
+        if value is NOT_SET:
+            return None
+        return self._found_files()[position].locate(item)
+
+    def sources(self, item):
+        sources = []
+        for config_file in self._iter_files():
+            sources += config_file.sources(item)
+        return sources
+
+    def changed(self):
+        return any(config_file.changed() for config_file in self._found or ())
 
     def reset(self):
+        self._found = None
+        self._paths = None
         self._config_files = None
+        self._index = {}
 
 
 class Dict(AbstractConfigurationLoader):
@@ -346,3 +1491,7 @@ class Dict(AbstractConfigurationLoader):
 
     def __getitem__(self, item):
         return self.values_mapping[item]
+
+    def get_many(self, items):
+        mapping = self.values_mapping
+        return {item: mapping[item] for item in items if item in mapping}
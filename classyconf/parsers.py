@@ -1,4 +1,11 @@
-from typing import Iterator, Tuple, Union
+from __future__ import annotations
+
+import io
+from collections.abc import Mapping
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Iterator, Tuple, Union
 
 STATE_INITIAL = "initial"
 STATE_PARSING_KEY = "parsing_key"
@@ -11,6 +18,7 @@ END_OF_LINE = "\n"
 ESCAPE_CHAR = "\\"
 SPACES = set(" \n")
 QUOTES = set("'\"")
+SPECIAL_TOKENS = QUOTES | {COMMENT, END_OF_LINE, ESCAPE_CHAR, "="}
 
 
 class BufferedStreamReader:
@@ -40,7 +48,12 @@ class BufferedStreamReader:
 
 
 class EnvFileParser:
-    def __init__(self, stream):
+    def __init__(self, stream, track_locations=False):
+        """
+        :param stream: File like object to parse.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined in ``locations``.
+        """
         self.state = STATE_INITIAL
         self._stream = BufferedStreamReader(stream)
 
@@ -49,9 +62,16 @@ class EnvFileParser:
         self._current_quote = ""
         self._key_parsed = False
 
+        #: Setting names to their ``(line, column)``, if tracked.
+        self.locations = {} if track_locations else None
+        self._line = 1
+        self._column = 0
+        self._key_start = None
+
     def parse_config(self) -> Iterator[Tuple[str, str]]:
         key = self._current_key
         value = self._current_value
+        tracking = self.locations is not None
 
         while True:
             char = self._stream.read_char()
@@ -60,6 +80,13 @@ class EnvFileParser:
                     yield self._return_current_config()
                 break
 
+            if tracking:
+                if char == END_OF_LINE:
+                    self._line += 1
+                    self._column = 0
+                else:
+                    self._column += 1
+
             if self._process_initial(char):
                 continue
 
@@ -130,6 +157,7 @@ class EnvFileParser:
             return True
 
         self._current_key.append(char)
+        self._key_start = (self._line, self._column)
         self.state = STATE_PARSING_KEY
         return True
 
@@ -182,11 +210,596 @@ class EnvFileParser:
 
     def _return_current_config(self) -> Tuple[str, str]:
         key, value = "".join(self._current_key), "".join(self._current_value)
+        key = key.rstrip()
+        if self.locations is not None:
+            self.locations[key] = self._key_start
         self._reset_state()
-        return key.rstrip(), value.rstrip()
+        return key, value.rstrip()
 
     def _reset_state(self):
         self.state = STATE_INITIAL
         self._current_key.clear()
         self._current_value.clear()
         self._key_parsed = False
+
+
+class FastEnvFileParser:
+    """
+    Same output as :py:class:`EnvFileParser`, a lot faster for big files.
+
+    The stream is read a line at a time. Lines without quotes, comments or
+    escapes, which are most of them, are split with ``str`` methods. The rest
+    are tokenized with a regex in runs of plain characters, and only the
+    special characters go through the state machine one at a time.
+    """
+
+    SPECIAL_CHARS = (COMMENT, ESCAPE_CHAR) + tuple(QUOTES)
+    _tokenizer = None
+
+    def __init__(self, stream, track_locations=False):
+        """
+        :param stream: File like object to parse.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined in ``locations``.
+        """
+        self._stream = stream
+        self.state = STATE_INITIAL
+        self.quote = ""
+        self._key = []
+        self._value = []
+        self._key_parsed = False
+        #: Setting names to their ``(line, column)``, if tracked.
+        self.locations = {} if track_locations else None
+        #: Number of lines fed so far.
+        self.lineno = 0
+        self._key_start = None
+        if self._tokenizer is None:
+            import re
+
+            # Runs of chars that are appended as they are, or a single char.
+            FastEnvFileParser._tokenizer = re.compile(r"[^\n#'\"\\=]+|[\s\S]")
+
+    @staticmethod
+    def _start_of(line, lineno):
+        # Keys always start at the first char of a line that isn't a space.
+        return lineno, len(line) - len(line.lstrip(" ")) + 1
+
+    def _is_plain(self, line):
+        for char in self.SPECIAL_CHARS:
+            if char in line:
+                return False
+        return True
+
+    def parse_config(self) -> Iterator[Tuple[str, str]]:
+        yield from self.feed(self._stream)
+        yield from self.flush()
+
+    def feed(self, lines) -> Iterator[Tuple[str, str]]:
+        """
+        Parse some more lines, picking up where the previous call left off.
+        """
+        # Same state as EnvFileParser, kept in locals while parsing. Keys and
+        # values are lists of non empty chunks, so they are falsy only when
+        # empty.
+        state = self.state
+        key = self._key
+        value = self._value
+        quote = self.quote
+        key_parsed = self._key_parsed
+        locations = self.locations
+        lineno = self.lineno
+        start = self._key_start
+        tokenize = self._tokenizer.findall
+
+        try:
+            for line in lines:
+                lineno += 1
+                if line.endswith(END_OF_LINE):
+                    body, eol = line[:-1], True
+                else:
+                    body, eol = line, False
+
+                if self._is_plain(body):
+                    # Only the initial and value states survive an end of line.
+                    if state == STATE_INITIAL:
+                        stripped = body.lstrip(" ")
+                        if not stripped:
+                            continue
+                        if locations is not None:
+                            start = (lineno, len(body) - len(stripped) + 1)
+                        body = stripped
+                        # The first char always belongs to the key, even a "="
+                        separator = body.find("=", 1)
+                        if separator == -1:
+                            if not eol:
+                                key.append(body)
+                                state = STATE_PARSING_KEY
+                            continue
+                        key.append(body[:separator])
+                        body = body[separator + 1 :]
+                        state = STATE_PARSING_VALUE
+                        key_parsed = True
+
+                    if not (value or quote):
+                        body = body.lstrip(" ")
+                    if body:
+                        value.append(body)
+                    if eol:
+                        name = "".join(key).rstrip()
+                        if locations is not None:
+                            locations[name] = start
+                        yield name, "".join(value).rstrip()
+                        state = STATE_INITIAL
+                        key, value = [], []
+                        key_parsed = False
+                    continue
+
+                for token in tokenize(line):
+                    if len(token) > 1 or token not in SPECIAL_TOKENS:
+                        # A run of chars without special meaning in any state,
+                        # besides leading spaces.
+                        if state == STATE_INITIAL:
+                            token = token.lstrip(" ")
+                            if token:
+                                key.append(token)
+                                state = STATE_PARSING_KEY
+                                if locations is not None:
+                                    start = self._start_of(line, lineno)
+                        elif state == STATE_PARSING_KEY:
+                            key.append(token)
+                        elif state == STATE_PARSING_VALUE:
+                            if not (value or quote):
+                                token = token.lstrip(" ")
+                            if token:
+                                value.append(token)
+                        elif state == STATE_PARSING_VALUE_ESCAPE:
+                            # That was a literal \
+                            value.append(ESCAPE_CHAR + token)
+                            state = STATE_PARSING_VALUE
+                        continue
+
+                    char = token
+                    if state == STATE_INITIAL:
+                        if char == COMMENT:
+                            state = STATE_PARSING_COMMENT
+                        elif char not in SPACES:
+                            key.append(char)
+                            state = STATE_PARSING_KEY
+                            if locations is not None:
+                                start = self._start_of(line, lineno)
+                        continue
+
+                    if char in QUOTES:
+                        if not quote:
+                            quote = char
+                        elif quote == char:
+                            quote = ""
+                        else:
+                            value.append(char)
+                        continue
+
+                    if char == COMMENT and not quote:
+                        state = STATE_PARSING_COMMENT
+                        continue
+
+                    if state == STATE_PARSING_COMMENT:
+                        if char == END_OF_LINE:
+                            if (key or value) and key_parsed:
+                                name = "".join(key).rstrip()
+                                if locations is not None:
+                                    locations[name] = start
+                                yield name, "".join(value).rstrip()
+                            state = STATE_INITIAL
+                            key, value = [], []
+                            key_parsed = False
+                    elif state == STATE_PARSING_KEY:
+                        if char == "=":
+                            state = STATE_PARSING_VALUE
+                            key_parsed = True
+                        elif char == END_OF_LINE:
+                            state = STATE_INITIAL
+                            key, value = [], []
+                            key_parsed = False
+                        else:
+                            key.append(char)
+                    elif state == STATE_PARSING_VALUE:
+                        if char == ESCAPE_CHAR:
+                            state = STATE_PARSING_VALUE_ESCAPE
+                        elif char == END_OF_LINE:
+                            name = "".join(key).rstrip()
+                            if locations is not None:
+                                locations[name] = start
+                            yield name, "".join(value).rstrip()
+                            state = STATE_INITIAL
+                            key, value = [], []
+                            key_parsed = False
+                        else:
+                            value.append(char)
+                    else:  # STATE_PARSING_VALUE_ESCAPE
+                        state = STATE_PARSING_VALUE
+                        if char != END_OF_LINE:
+                            # That was a literal \
+                            value.extend([ESCAPE_CHAR, char])
+        finally:
+            self.state, self.quote = state, quote
+            self._key, self._value, self._key_parsed = key, value, key_parsed
+            self.lineno, self._key_start = lineno, start
+
+    def flush(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield the last setting, when the input doesn't end with a new line.
+        """
+        key, value = self._key, self._value
+        if key or value:
+            name = "".join(key).rstrip()
+            if self.locations is not None:
+                self.locations[name] = self._key_start
+            yield name, "".join(value).rstrip()
+        self.state = STATE_INITIAL
+        self._key, self._value = [], []
+        self._key_parsed = False
+
+
+class MappedValues(Mapping):
+    """
+    Settings parsed by :py:class:`MmapEnvFileParser`. Values are kept as the
+    offset where they start in the mapped file, up to the end of the line,
+    until they are looked up.
+
+    If the file was truncated in place meanwhile, reading the mapping past its
+    new end would crash the process with ``SIGBUS``, so the file is parsed
+    again instead, without mapping it.
+    """
+
+    def __init__(self, mapped, values, encoding="utf-8", filename=None):
+        self._mapped = mapped
+        self._values = values
+        self._encoding = encoding
+        self._filename = filename
+
+    def _reparse(self):
+        values = {}
+        if self._filename is not None:
+            try:
+                with open(self._filename, "rb") as file_:
+                    content = file_.read().decode(self._encoding)
+            except OSError:
+                pass
+            else:
+                text = io.StringIO(content, newline=None)
+                values.update(FastEnvFileParser(text).parse_config())
+        self._mapped.close()
+        self._mapped = None
+        self._values = values
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        if type(value) is int:
+            mapped = self._mapped
+            if mapped.size() < len(mapped):
+                self._reparse()
+                return self._values[key]
+            end = mapped.find(b"\n", value)
+            if end == -1:
+                end = len(mapped)
+            value = mapped[value:end].decode(self._encoding).rstrip()
+            self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class MmapEnvFileParser:
+    """
+    Same output as :py:class:`EnvFileParser`, for big files opened in binary
+    mode.
+
+    The file is mapped in memory and scanned as bytes. For plain lines, only
+    the key is decoded; the value is recorded as an offset into the mapping
+    and decoded the first time it is looked up. The rest of the lines are decoded
+    and handed to a :py:class:`FastEnvFileParser`. Since the mapping is backed
+    by the page cache, processes reading the same file share its memory.
+
+    The encoding must be ASCII compatible, like UTF-8 or Latin-1. Files are
+    better replaced than rewritten in place while they are mapped: values not
+    looked up yet would be read at their old offsets in the new content.
+    """
+
+    _special = None
+
+    def __init__(self, stream, encoding="utf-8", track_locations=False):
+        """
+        :param stream: File opened in binary mode.
+        :param str encoding: Encoding of the file.
+        :param bool track_locations: Record the line and column where each
+                                     setting is defined in ``locations``.
+        """
+        self._stream = stream
+        self.encoding = encoding
+        self.locations = {} if track_locations else None
+        if self._special is None:
+            import re
+
+            MmapEnvFileParser._special = re.compile(rb"[#'\"\\]")
+
+    def parse_config(self) -> Iterator[Tuple[str, str]]:
+        values = self.parse()
+        for key in values:
+            yield key, values[key]
+
+    def parse(self) -> MappedValues:
+        """
+        :return: Mapping of the settings, decoding values on lookup.
+        :rtype: MappedValues
+        """
+        import mmap
+
+        try:
+            mapped = mmap.mmap(self._stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            return MappedValues(None, {}, self.encoding)
+
+        if mapped.find(b"\r") != -1:
+            # Let io translate new lines, as it does for files in text mode.
+            text = io.StringIO(mapped[:].decode(self.encoding), newline=None)
+            mapped.close()
+            parser = FastEnvFileParser(text, self.locations is not None)
+            values = dict(parser.parse_config())
+            self.locations = parser.locations
+            return MappedValues(None, values, self.encoding)
+
+        filename = getattr(self._stream, "name", None)
+        if isinstance(filename, int):  # opened from a file descriptor
+            filename = None
+        return MappedValues(mapped, self._index(mapped), self.encoding, filename)
+
+    def _index(self, mapped):
+        encoding = self.encoding
+        search = self._special.search
+        machine = FastEnvFileParser(None, self.locations is not None)
+        locations = self.locations = machine.locations
+        lineno = 0
+        values = {}
+        size = len(mapped)
+        special = -1  # offset of the next special char, if already searched
+        position = 0
+
+        while position < size:
+            end = mapped.find(b"\n", position)
+            eol = end != -1
+            if not eol:
+                end = size
+
+            if special < position:
+                match = search(mapped, position)
+                special = match.start() if match else size
+
+            if special >= end and machine.state == STATE_INITIAL:
+                # A plain line, starting a new setting.
+                lineno += 1
+                start = position
+                while start < end and mapped[start] == 32:
+                    start += 1
+                if locations is not None and start < end:
+                    machine._key_start = (lineno, start - position + 1)
+                # The first char always belongs to the key, even a "="
+                separator = mapped.find(b"=", start + 1, end)
+                if separator != -1:
+                    key = mapped[start:separator].decode(encoding).rstrip()
+                    if locations is not None:
+                        locations[key] = machine._key_start
+                    start = separator + 1
+                    if not machine.quote:
+                        while start < end and mapped[start] == 32:
+                            start += 1
+                    values[key] = start
+                    position = end + 1
+                    continue
+                if start == end or eol:
+                    position = end + 1
+                    continue
+                lineno -= 1
+
+            # Hand over this line, and the ones after it that are not plain.
+            while end < size:
+                following = mapped.find(b"\n", end + 1)
+                if following == -1:
+                    following = size
+                match = search(mapped, end + 1, following)
+                if match is None:
+                    break
+                end = following
+            special = -1
+
+            lines = io.StringIO(mapped[position : end + 1].decode(encoding))
+            machine.lineno = lineno
+            for key, value in machine.feed(lines):
+                values[key] = value
+            lineno = machine.lineno
+            position = end + 1
+
+        for key, value in machine.flush():
+            values[key] = value
+        return values
+
+
+class IniSectionParser:
+    """
+    Reads a single section of an ``.ini`` file, along with the ``DEFAULT``
+    section, into a dictionary. The rest of the file is skipped without
+    parsing its options.
+
+    Valid files give the same raw values as ``ConfigParser(allow_no_value=True)``:
+    option names are lower cased, values are stripped and may continue on
+    indented lines, and lines starting with ``#`` or ``;`` are comments.
+    Duplicated sections and options are not reported, the last one wins.
+    """
+
+    DEFAULT_SECTION = "DEFAULT"
+    COMMENT_PREFIXES = ("#", ";")
+
+    def __init__(self, stream, section, track_locations=False):
+        """
+        :param stream: File like object to parse.
+        :param str section: Name of the section to read.
+        :param bool track_locations: Record the line and column where each
+                                     option is defined in ``locations``.
+        """
+        self._stream = stream
+        self.section = section
+        #: Section names to option names to their ``(line, column)``, if
+        #: tracked.
+        self.locations = {} if track_locations else None
+
+    def parse(self) -> Union[dict, None]:
+        """
+        :return: Dictionary of option names to their values, or ``None`` if
+                 the section is not in the file.
+        :raises InvalidConfigurationFile: If an option comes before any section
+                                          or has no name.
+        """
+        from .exceptions import InvalidConfigurationFile
+
+        defaults = {}
+        values = None
+        locations = self.locations
+        current = None  # the options being read, None for skipped sections
+        current_locations = None
+        option = None  # name of the last option, for continuation lines
+        in_section = False
+        indent_level = 0
+        lineno = 0
+
+        for line in self._stream:
+            lineno += 1
+            value = line.strip()
+            if not value or value.startswith(self.COMMENT_PREFIXES):
+                # Blank lines are kept inside values, comments are not.
+                if not value and current is not None and option:
+                    lines = current[option]
+                    if lines is not None:
+                        lines.append("")
+                continue
+
+            indent = len(line) - len(line.lstrip())
+            if option and indent > indent_level:
+                if current is not None:
+                    if current[option] is None:
+                        raise InvalidConfigurationFile(
+                            "Line {} continues an option without value".format(lineno)
+                        )
+                    current[option].append(value)
+                continue
+            indent_level = indent
+
+            end = value.rfind("]")
+            if value[0] == "[" and end > 1:
+                header = value[1:end]
+                if header == self.DEFAULT_SECTION:
+                    current = defaults
+                elif header == self.section:
+                    current = values = {} if values is None else values
+                else:
+                    current = None
+                if locations is not None:
+                    current_locations = locations.setdefault(header, {})
+                in_section = True
+                option = None
+                continue
+
+            if not in_section:
+                raise InvalidConfigurationFile("File contains no section headers")
+
+            if current is None:
+                option = True  # an option of a skipped section
+                continue
+
+            equals, colon = value.find("="), value.find(":")
+            if equals == -1 or colon != -1 and colon < equals:
+                equals = colon
+            if equals == -1:
+                option, lines = value, None
+            else:
+                option, lines = value[:equals].rstrip(), [value[equals + 1 :].strip()]
+            if not option:
+                raise InvalidConfigurationFile("Line {} has no option".format(lineno))
+            option = option.lower()
+            current[option] = lines
+            if current_locations is not None:
+                current_locations[option] = (lineno, indent + 1)
+
+        if values is None:
+            return None
+
+        section = {}
+        for options in (defaults, values):
+            for option, lines in options.items():
+                section[option] = None if lines is None else "\n".join(lines).rstrip()
+        return section
+
+
+#: How many references ``interpolate`` follows, like ``ConfigParser``.
+MAX_INTERPOLATION_DEPTH = 10
+
+
+def interpolate(values, section, option, value, depth=1):
+    """
+    Replace ``%(name)s`` references with the values of other options and
+    ``%%`` with ``%``, like the default interpolation of ``ConfigParser``.
+
+    :param dict values: Raw values of the options of the section.
+    :param str section: Name of the section, for error messages.
+    :param str option: Name of the option being interpolated.
+    :param str value: Raw value of the option.
+    :raises configparser.InterpolationError: On invalid references.
+    """
+    if "%" not in value:
+        return value
+
+    import configparser
+
+    if depth > MAX_INTERPOLATION_DEPTH:
+        raise configparser.InterpolationDepthError(option, section, values[option])
+
+    accum = []
+    rest = value
+    while rest:
+        position = rest.find("%")
+        if position < 0:
+            accum.append(rest)
+            break
+        accum.append(rest[:position])
+        rest = rest[position:]
+        char = rest[1:2]
+        if char == "%":
+            accum.append("%")
+            rest = rest[2:]
+        elif char == "(":
+            end = rest.find(")s")
+            if end < 3 or ")" in rest[2:end]:
+                raise configparser.InterpolationSyntaxError(
+                    option, section, "bad interpolation variable reference %r" % rest
+                )
+            reference = rest[2:end].lower()
+            rest = rest[end + 2 :]
+            if reference not in values:
+                raise configparser.InterpolationMissingOptionError(
+                    option, section, values.get(option, value), reference
+                )
+            accum.append(
+                interpolate(values, section, option, values[reference], depth + 1)
+            )
+        else:
+            raise configparser.InterpolationSyntaxError(
+                option,
+                section,
+                "'%%' must be followed by '%%' or '(', found: %r" % (rest,),
+            )
+    return "".join(accum)
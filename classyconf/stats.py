@@ -0,0 +1,134 @@
+from collections import namedtuple
+from time import perf_counter
+
+from .configuration import fallback
+
+#: Passed to the ``on_lookup`` hook after every lookup that reaches the
+#: loaders. ``loader`` is ``None`` when the value fell back to its default.
+LookupEvent = namedtuple("LookupEvent", "key loader elapsed cast_elapsed misses")
+
+
+class KeyStats:
+    __slots__ = ("lookups", "time", "max_time", "cast_time", "defaults", "loader")
+
+    def __init__(self):
+        self.lookups = 0
+        self.time = 0.0
+        self.max_time = 0.0
+        self.cast_time = 0.0
+        self.defaults = 0
+        self.loader = None
+
+    def as_dict(self):
+        return {
+            "lookups": self.lookups,
+            "time": self.time,
+            "max_time": self.max_time,
+            "cast_time": self.cast_time,
+            "defaults": self.defaults,
+            "loader": None if self.loader is None else repr(self.loader),
+        }
+
+
+class LoaderStats:
+    __slots__ = ("hits", "misses", "time")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.time = 0.0
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "time": self.time}
+
+
+class LookupStats:
+    """
+    Drop-in replacement for :py:func:`classyconf.configuration.lookup` that
+    records timings and counters about each lookup. Only used when a
+    configuration is instrumented, so it costs nothing otherwise.
+    """
+
+    def __init__(self, hook=None):
+        """
+        :param function hook: Called with a ``LookupEvent`` after every lookup.
+        """
+        self.hook = hook
+        self.keys = {}
+        self.loaders = {}
+
+    def _loader_stats(self, loader):
+        try:
+            return self.loaders[id(loader)][1]
+        except KeyError:
+            stats = LoaderStats()
+            self.loaders[id(loader)] = (loader, stats)
+            return stats
+
+    def __call__(self, item, default, cast, loaders, missing=None):
+        start = perf_counter()
+        misses = 0
+        winner = None
+        cast_elapsed = 0.0
+
+        try:
+            for loader in loaders:
+                loader_stats = self._loader_stats(loader)
+                loader_start = perf_counter()
+                try:
+                    value = loader[item]
+                except KeyError:
+                    loader_stats.time += perf_counter() - loader_start
+                    loader_stats.misses += 1
+                    misses += 1
+                    continue
+                loader_stats.time += perf_counter() - loader_start
+
+                cast_start = perf_counter()
+                try:
+                    value = cast(value)
+                except KeyError:
+                    loader_stats.misses += 1
+                    misses += 1
+                    continue
+                finally:
+                    cast_elapsed = perf_counter() - cast_start
+
+                loader_stats.hits += 1
+                winner = loader
+                return value
+
+            if missing is not None:
+                missing.add(item)
+
+            cast_start = perf_counter()
+            try:
+                return fallback(item, default, cast)
+            finally:
+                cast_elapsed = perf_counter() - cast_start
+        finally:
+            self._record(item, winner, perf_counter() - start, cast_elapsed, misses)
+
+    def _record(self, item, loader, elapsed, cast_elapsed, misses):
+        stats = self.keys.get(item)
+        if stats is None:
+            stats = self.keys[item] = KeyStats()
+        stats.lookups += 1
+        stats.time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        stats.cast_time += cast_elapsed
+        stats.loader = loader
+        if loader is None:
+            stats.defaults += 1
+
+        if self.hook is not None:
+            self.hook(LookupEvent(item, loader, elapsed, cast_elapsed, misses))
+
+    def as_dict(self):
+        return {
+            "keys": {key: stats.as_dict() for key, stats in self.keys.items()},
+            "loaders": [
+                dict(stats.as_dict(), loader=repr(loader))
+                for loader, stats in self.loaders.values()
+            ],
+        }
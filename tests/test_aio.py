@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from classyconf.aio import AsyncConfiguration
+from classyconf.configuration import Value
+from classyconf.exceptions import UnknownConfiguration
+from classyconf.loaders import AbstractConfigurationLoader, Dict, EnvFile, IniFile
+
+
+class AppConfig(AsyncConfiguration):
+    ENVFILE = Value()
+    INIFILE = Value()
+    NUMBER = Value(default=1)
+
+
+class NumberConfig(AsyncConfiguration):
+    NUMBER = Value(default=1)
+
+
+class AsyncDict(Dict):
+    def __init__(self, values_mapping):
+        super().__init__({})
+        self._pending = values_mapping
+        self.preloads = 0
+
+    async def apreload(self):
+        self.preloads += 1
+        await asyncio.sleep(0)
+        self.values_mapping = self._pending
+
+
+class ThreadRecorder(AbstractConfigurationLoader):
+    blocking = True
+
+    def __init__(self):
+        self.thread = None
+
+    def preload(self):
+        self.thread = threading.current_thread()
+
+    def __getitem__(self, item):
+        raise KeyError(item)
+
+
+def test_aget(env_config, ini_config):
+    config = AppConfig(loaders=[EnvFile(env_config), IniFile(ini_config)])
+
+    async def main():
+        return (
+            await config.aget("ENVFILE"),
+            await config.aget("INIFILE"),
+            await config.aget("NUMBER"),
+            await config.aget("NUMBER", default=0, cast=str),
+        )
+
+    assert asyncio.run(main()) == (
+        "Environment File Value",
+        "INI File Value",
+        1,
+        "0",
+    )
+
+
+def test_aget_unknown_configuration():
+    config = AppConfig(loaders=[])
+
+    with pytest.raises(UnknownConfiguration):
+        asyncio.run(config.aget("ENVFILE"))
+
+
+def test_preload_runs_blocking_loaders_off_loop():
+    loader = ThreadRecorder()
+    config = AppConfig(loaders=[loader])
+    asyncio.run(config.preload())
+
+    assert loader.thread is not None
+    assert loader.thread is not threading.main_thread()
+
+
+def test_preload_async_loader_once():
+    loader = AsyncDict({"NUMBER": "2"})
+    config = NumberConfig(loaders=[loader])
+
+    async def main():
+        results = await asyncio.gather(*(config.aget("NUMBER") for _ in range(5)))
+        return results, await config.aload_all()
+
+    results, values = asyncio.run(main())
+    assert results == [2] * 5
+    assert values == {"NUMBER": 2}
+    assert loader.preloads == 1
+
+    config.reset()
+    asyncio.run(config.preload())
+    assert loader.preloads == 2
+
+
+def test_preload_non_blocking_loader():
+    os.environ["ENVFILE"] = "Environment Variable Value"
+    config = AppConfig()
+
+    assert asyncio.run(config.aget("ENVFILE")) == "Environment Variable Value"
+    del os.environ["ENVFILE"]
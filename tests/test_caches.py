@@ -0,0 +1,144 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+from classyconf.caches import ForeverCache, LRUCache, ParseCache, TTLCache
+
+
+def test_forever_cache():
+    cache = ForeverCache()
+    cache.set("KEY", "value")
+
+    assert cache["KEY"] == "value"
+    with pytest.raises(KeyError):
+        cache["MISSING"]
+
+
+def test_forever_cache_honors_ttl():
+    cache = ForeverCache()
+    with patch("classyconf.caches.monotonic", return_value=10):
+        cache.set("KEY", "value", ttl=5)
+        cache.set("OTHER", "value")
+        assert cache["KEY"] == "value"
+
+    with patch("classyconf.caches.monotonic", return_value=15):
+        with pytest.raises(KeyError):
+            cache["KEY"]
+        assert cache["OTHER"] == "value"
+
+
+def test_ttl_cache():
+    cache = TTLCache(ttl=5)
+    with patch("classyconf.caches.monotonic", return_value=10):
+        cache.set("KEY", "value")
+        cache.set("LONGER", "value", ttl=10)
+
+    with patch("classyconf.caches.monotonic", return_value=15):
+        with pytest.raises(KeyError):
+            cache["KEY"]
+        assert cache["LONGER"] == "value"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("A", 1)
+    cache.set("B", 2)
+    assert cache["A"] == 1
+    cache.set("C", 3)
+
+    assert cache["A"] == 1
+    assert cache["C"] == 3
+    with pytest.raises(KeyError):
+        cache["B"]
+
+
+def test_invalidate_and_clear():
+    cache = LRUCache()
+    cache.set("A", 1, ttl=5)
+    cache.set("B", 2)
+    cache.invalidate("A")
+
+    with pytest.raises(KeyError):
+        cache["A"]
+    assert cache["B"] == 2
+
+    cache.clear()
+    with pytest.raises(KeyError):
+        cache["B"]
+
+
+@pytest.mark.parametrize(
+    "cache,expected",
+    [
+        (ForeverCache(), "ForeverCache()"),
+        (TTLCache(ttl=5), "TTLCache(ttl=5)"),
+        (LRUCache(maxsize=3), "LRUCache(maxsize=3, ttl=None)"),
+    ],
+)
+def test_clone_is_empty_with_same_policy(cache, expected):
+    cache.set("A", 1)
+    clone = cache.clone()
+
+    assert repr(clone) == expected
+    with pytest.raises(KeyError):
+        clone["A"]
+
+
+def test_parse_cache(tmp_path):
+    filename = tmp_path / "settings"
+    filename.write_text("first")
+    cache = ParseCache()
+
+    def parse():
+        return filename.read_text()
+
+    assert cache.get(str(filename), "text", parse) == "first"
+    assert cache.get(str(tmp_path / ".." / tmp_path.name / "settings"), "text", parse)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    filename.write_text("second!")
+    assert cache.get(str(filename), "text", parse) == "second!"
+    assert cache.get(str(filename), "other", lambda: "other") == "other"
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert len(cache) == 2
+
+
+def test_parse_cache_is_bounded(tmp_path):
+    cache = ParseCache(maxsize=2)
+    for name in "abc":
+        filename = tmp_path / name
+        filename.write_text(name)
+        cache.get(str(filename), "text", filename.read_text)
+
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_parse_cache_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ParseCache().get(str(tmp_path / "missing"), "text", lambda: "")
+
+
+def test_parse_cache_dump(tmp_path):
+    old = tmp_path / "old"
+    old.write_text("old")
+    os.utime(str(old), (0, 0))
+    new = tmp_path / "new"
+    new.write_text("new")
+    cache = ParseCache()
+    for filename in (old, new):
+        cache.get(str(filename), "text", filename.read_text)
+
+    dump = io.BytesIO()
+    cache.dump(dump)
+    dump.seek(0)
+    loaded = ParseCache()
+    loaded.load(dump)
+
+    assert len(loaded) == 1
+    assert loaded.get(str(old), "text", lambda: "parsed") == "old"
+    assert loaded.get(str(new), "text", lambda: "parsed") == "parsed"
+    assert bool(ParseCache())
@@ -1,6 +1,6 @@
 import pytest
 
-from classyconf.loaders import IniFile
+from classyconf.loaders import IniFile, Location, Source
 
 
 def test_basic_config_object(inifile):
@@ -9,13 +9,15 @@ def test_basic_config_object(inifile):
     assert repr(config) == 'IniFile("{}")'.format(inifile)
 
 
-def test_fail_no_settings_section_in_ini_file(files_path):
+@pytest.mark.parametrize("fast", [False, True])
+def test_fail_no_settings_section_in_ini_file(files_path, fast):
     with pytest.raises(KeyError):
-        return IniFile(files_path + "/invalid_section.ini")["some_value"]
+        return IniFile(files_path + "/invalid_section.ini", fast=fast)["some_value"]
 
 
-def test_config_file_parsing(inifile):
-    config = IniFile(inifile)
+@pytest.mark.parametrize("options", [{}, {"fast": True, "interpolation": True}])
+def test_config_file_parsing(inifile, options):
+    config = IniFile(inifile, **options)
 
     assert config["KEY"] == "Value"
     assert config["KEY_EMPTY"] == ""
@@ -35,8 +37,9 @@ def test_skip_missing_key(inifile):
         return IniFile(inifile)["some_value"]
 
 
-def test_skip_invalid_ini_file(files_path):
-    config = IniFile(files_path + "/invalid_chars.cfg")
+@pytest.mark.parametrize("fast", [False, True])
+def test_skip_invalid_ini_file(files_path, fast):
+    config = IniFile(files_path + "/invalid_chars.cfg", fast=fast)
 
     with pytest.raises(KeyError):
         return config["some_value"]
@@ -76,3 +79,93 @@ def test_reset(inifile):
     assert config._initialized
     config.reset()
     assert not config._initialized
+
+
+def test_get_many(inifile):
+    config = IniFile(inifile)
+
+    assert config.get_many(["KEY", "PERCENT_ESCAPED", "UNKNOWN"]) == {
+        "KEY": "Value",
+        "PERCENT_ESCAPED": "%",
+    }
+
+
+def test_get_many_missing_inifile():
+    assert IniFile("does-not-exist.ini").get_many(["KEY"]) == {}
+
+
+def test_locate(create_file, files_path):
+    filename = files_path + "/../settings.ini"
+    create_file(filename, "[DEFAULT]\nBAR=default\n\n[settings]\n  FOO = bar\n")
+    config = IniFile(filename, track_locations=True)
+
+    assert config.locate("FOO") == (filename, 5, 3)
+    assert config.locate("BAR") == (filename, 2, 1)
+    assert config.locate("UNKNOWN") is None
+    assert config.sources("FOO") == [Source(config, "bar", (filename, 5, 3))]
+    assert config["FOO"] == "bar"
+
+
+def test_locate_untracked(inifile):
+    config = IniFile(inifile)
+
+    assert config.locate("KEY") == Location(inifile, None, None)
+
+
+def test_shared(inifile):
+    config = IniFile(inifile, shared=True)
+    other = IniFile(inifile, shared=True)
+
+    assert config["KEY"] == other["KEY"] == "Value"
+    assert config.parser is other.parser
+    assert "KEY" not in IniFile(inifile, section="missing", shared=True)
+
+
+def test_revalidate(tmp_path):
+    filename = tmp_path / "settings.ini"
+    filename.write_text("[settings]\nKEY=value\n")
+    config = IniFile(str(filename))
+    revalidated = IniFile(str(filename), revalidate=0)
+
+    assert config["KEY"] == revalidated["KEY"] == "value"
+
+    filename.write_text("[settings]\nKEY=new value\n")
+    assert config["KEY"] == "value"
+    assert revalidated["KEY"] == "new value"
+
+    filename.write_text("[other]\nKEY=value\n")
+    assert "KEY" not in revalidated
+    filename.write_text("[settings]\nKEY=fixed\n")
+    assert revalidated["KEY"] == "fixed"
+
+
+def test_file_created_later(tmp_path):
+    filename = tmp_path / "settings.ini"
+    config = IniFile(str(filename))
+    assert "KEY" not in config
+
+    filename.write_text("[settings]\nKEY=value\n")
+    assert config["KEY"] == "value"
+
+
+def test_fast_without_interpolation(inifile):
+    config = IniFile(inifile, fast=True)
+
+    assert config["HASH_CONTENT"] == "Foo 'Bar # Baz' %(key)s"
+    assert config["PERCENT_ESCAPED"] == "%%"
+    assert config.get_many(["KEY", "_var", "missing"]) == {
+        "KEY": "Value",
+        "_var": "test",
+    }
+    assert config.values["key"] == "Value"
+    assert config.parser is None
+
+
+def test_fast_locate(create_file, files_path):
+    filename = files_path + "/../settings.ini"
+    create_file(filename, "[DEFAULT]\nBAR=default\n\n[settings]\n  FOO = bar\n")
+    config = IniFile(filename, fast=True, track_locations=True)
+
+    assert config["BAR"] == "default"
+    assert config.locate("FOO") == (filename, 5, 3)
+    assert config.locate("BAR") == (filename, 2, 1)
@@ -34,3 +34,7 @@ def test_does_not_ignore_set_values():
 
 def test_contains_missing_keys(command_line_config):
     assert "var3" not in command_line_config
+
+
+def test_get_many(command_line_config):
+    assert command_line_config.get_many(["var", "var2"]) == {"var2": "foo"}
@@ -1,9 +1,13 @@
 import os
+import pickle
+from unittest.mock import patch
 
 import pytest
-from classyconf.configuration import Configuration, Value, getconf
+
+from classyconf.caches import ForeverCache, LRUCache
+from classyconf.configuration import Configuration, Value, as_boolean, as_list, getconf
 from classyconf.exceptions import UnknownConfiguration
-from classyconf.loaders import EnvFile, Environment, IniFile
+from classyconf.loaders import NOT_SET, Dict, EnvFile, Environment, IniFile, Source
 
 
 class BasicClassyConf(Configuration):
@@ -153,3 +157,267 @@ def test_int_as_default_value():
 def test_str_as_default_value():
     os.environ["STR"] = "1"
     assert getconf("STR", default="foo", loaders=[Environment()]) == "1"
+
+
+def test_values_are_compiled_by_the_metaclass():
+    class CompiledConf(Configuration):
+        FLAG = Value(default=False)
+        NUMBER = Value(default=1)
+
+    assert CompiledConf.FLAG._plan == ("FLAG", False, as_boolean, None)
+    assert CompiledConf.NUMBER._plan == ("NUMBER", 1, int, None)
+
+
+def test_values_are_compiled_again_when_changed():
+    class CompiledConf(Configuration):
+        PORT = Value(default="80")
+
+    config = CompiledConf(loaders=[])
+    assert config.PORT == "80"
+
+    CompiledConf.PORT.default = 8080
+    CompiledConf.PORT.cast = int
+    assert config.PORT == 8080
+    assert CompiledConf.PORT._plan == ("PORT", 8080, int, None)
+
+
+def test_attribute_access_through_call_override():
+    class UpperConf(Configuration):
+        NAME = Value(default="name")
+
+        def __call__(self, key, *, default=NOT_SET, cast=None):
+            return super().__call__(key, default=default, cast=cast).upper()
+
+    config = UpperConf(loaders=[])
+    assert config.NAME == config("NAME", default="name") == "NAME"
+
+
+def test_fail_invalid_cast_type_on_declaration():
+    with pytest.raises(TypeError):
+
+        class InvalidCastConf(Configuration):
+            INTEGER = Value(cast="not callable")
+
+
+def test_call_and_attribute_access_resolve_the_same_value():
+    os.environ["INTEGER"] = "42"
+
+    class IntegerConf(Configuration):
+        INTEGER = Value(default=0)
+
+    config = IntegerConf()
+    assert config.INTEGER == config("INTEGER", default=0) == 42
+    del os.environ["INTEGER"]
+
+
+class SnapshotClassyConf(Configuration):
+    ENVVAR = Value()
+    ENVFILE = Value()
+    NUMBER = Value(default=1)
+
+
+def test_freeze(env_config):
+    config = SnapshotClassyConf(loaders=[EnvFile(env_config)])
+    frozen = config.freeze()
+
+    assert frozen.ENVFILE == "Environment File Value"
+    assert frozen["ENVVAR"] == "Must be overrided"
+    assert frozen.NUMBER == 1
+    assert repr(frozen).startswith("FrozenSnapshotClassyConf(ENVVAR=")
+    assert dict(frozen)["ENVFILE"] == "Environment File Value"
+    assert frozen == config.freeze()
+    assert hash(frozen) == hash(config.freeze())
+    assert not hasattr(frozen, "__dict__")
+
+
+def test_freeze_is_hashable_with_lists_and_dicts():
+    class ListConf(Configuration):
+        HOSTS = Value(default="a, b", cast=as_list)
+        OPTIONS = Value(default="x", cast=lambda value: {value: [1, 2]})
+
+    frozen = ListConf(loaders=[]).freeze()
+
+    assert frozen.HOSTS == ["a", "b"]
+    assert hash(frozen) == hash(ListConf(loaders=[]).freeze())
+    assert len({frozen, ListConf(loaders=[]).freeze()}) == 1
+
+
+def test_freeze_values_named_like_helpers():
+    class HelperNamesConf(Configuration):
+        _values = Value(default=1)
+        _thaw = Value(default=2)
+
+    frozen = HelperNamesConf(loaders=[]).freeze()
+
+    assert frozen._values == 1
+    assert dict(frozen) == {"_values": 1, "_thaw": 2}
+    assert hash(frozen) == hash(HelperNamesConf(loaders=[]).freeze())
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_freeze_is_immutable(env_config):
+    frozen = SnapshotClassyConf(loaders=[EnvFile(env_config)]).freeze()
+
+    with pytest.raises(AttributeError):
+        frozen.ENVFILE = "foo"
+
+    with pytest.raises(AttributeError):
+        del frozen.ENVFILE
+
+
+def test_freeze_is_picklable(env_config):
+    frozen = SnapshotClassyConf(loaders=[EnvFile(env_config)]).freeze()
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_freeze_fails_on_missing_value():
+    with pytest.raises(UnknownConfiguration):
+        SnapshotClassyConf(loaders=[]).freeze()
+
+
+def test_load_all(env_config):
+    os.environ["ENVVAR"] = "Environment Variable Value"
+    config = SnapshotClassyConf(loaders=[Environment(), EnvFile(env_config)])
+
+    assert config.load_all() == {
+        "ENVVAR": "Environment Variable Value",
+        "ENVFILE": "Environment File Value",
+        "NUMBER": 1,
+    }
+    del os.environ["ENVVAR"]
+
+
+def test_load_all_fills_cache(env_config):
+    config = SnapshotClassyConf(loaders=[EnvFile(env_config)], cache=True)
+    config.load_all()
+
+    os.environ["ENVFILE"] = "Environment Variable Value"
+    assert config.ENVFILE == "Environment File Value"
+    del os.environ["ENVFILE"]
+
+
+def test_load_all_fails_on_missing_value():
+    with pytest.raises(UnknownConfiguration):
+        SnapshotClassyConf(loaders=[]).load_all()
+
+
+def test_cache_policy(env_config):
+    config = ChildClassyConf(loaders=[EnvFile(env_config)], cache=LRUCache(1))
+    assert config._cache
+    assert isinstance(config._cached_values, LRUCache)
+    assert config._cached_values.maxsize == 1
+
+
+def test_cache_policy_is_not_shared_between_instances():
+    class CachedConf(Configuration):
+        class Meta:
+            cache = ForeverCache()
+
+    assert CachedConf()._cached_values is not CachedConf()._cached_values
+
+
+def test_value_ttl():
+    class TTLConf(Configuration):
+        ROTATED = Value(ttl=5)
+
+    os.environ["ROTATED"] = "old"
+    config = TTLConf(cache=True)
+    with patch("classyconf.caches.monotonic", return_value=10):
+        assert config.ROTATED == "old"
+
+    os.environ["ROTATED"] = "new"
+    with patch("classyconf.caches.monotonic", return_value=12):
+        assert config.ROTATED == "old"
+    with patch("classyconf.caches.monotonic", return_value=15):
+        assert config.ROTATED == "new"
+    del os.environ["ROTATED"]
+
+
+def test_reset_clears_cache(env_config):
+    config = ChildClassyConf(loaders=[Environment(), EnvFile(env_config)], cache=True)
+    assert config.ENVFILE == "Environment File Value"
+    os.environ["ENVFILE"] = "Environment Variable Value"
+    config.reset()
+    assert config.ENVFILE == "Environment Variable Value"
+    del os.environ["ENVFILE"]
+
+
+def test_negative_cache_default_meta():
+    class NegativeCacheConf(Configuration):
+        class Meta:
+            negative_cache = True
+
+    assert Configuration()._negative_cache is False
+    assert NegativeCacheConf()._negative_cache is True
+    assert Configuration(negative_cache=True)._negative_cache is True
+
+
+def test_negative_cache():
+    class DefaultConf(Configuration):
+        MISSING = Value(default=0)
+
+    config = DefaultConf(negative_cache=True)
+    assert config.MISSING == 0
+    assert config.negative_cache_hits == 0
+
+    os.environ["MISSING"] = "1"
+    assert config.MISSING == 0
+    assert config.negative_cache_hits == 1
+
+    config.reset()
+    assert config.MISSING == 1
+    assert config.negative_cache_hits == 1
+    del os.environ["MISSING"]
+
+
+def test_negative_cache_unknown_configuration():
+    config = BasicClassyConf(negative_cache=True)
+
+    for _ in range(2):
+        with pytest.raises(UnknownConfiguration):
+            config.ENVVAR2
+    assert config.negative_cache_hits == 1
+
+
+def test_negative_cache_invalidated_by_changed_loader():
+    loader = Dict({})
+    config = ChildClassyConf(loaders=[loader], negative_cache=True)
+
+    with pytest.raises(UnknownConfiguration):
+        config.ENVVAR
+
+    loader.values_mapping["ENVVAR"] = "found"
+    with patch.object(Dict, "changed", return_value=True):
+        assert config.ENVVAR == "found"
+    assert config.negative_cache_hits == 0
+
+
+def test_negative_cache_invalidated_by_created_file(tmp_path):
+    class DefaultConf(Configuration):
+        LATER = Value(default="dflt")
+
+    filename = tmp_path / "later.env"
+    config = DefaultConf(loaders=[EnvFile(str(filename))], negative_cache=True)
+    assert config.LATER == "dflt"
+    assert config.LATER == "dflt"
+    assert config.negative_cache_hits == 1
+
+    filename.write_text("LATER=fromfile\n")
+    assert config.LATER == "fromfile"
+
+
+def test_explain(env_config, ini_config):
+    envfile = EnvFile(env_config, track_locations=True)
+    inifile = IniFile(ini_config, track_locations=True)
+    config = ChildClassyConf(loaders=[envfile, inifile])
+
+    explanation = config.explain("ENVFILE")
+    assert explanation.value == "Environment File Value"
+    assert explanation.loader is envfile
+    assert explanation.location == (env_config, 2, 1)
+    assert explanation.shadowed == [
+        Source(inifile, "Must be overrided", (ini_config, 4, 1))
+    ]
+
+    assert config.explain("INIFILE").loader is inifile
+    assert config.explain("ENVVAR2") == ("ENVVAR2", NOT_SET, None, None, [])
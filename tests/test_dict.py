@@ -21,3 +21,9 @@ def test_config_file_parsing(inifile):
     assert config["KEY_EMPTY"] == ""
     assert "KEY" in config
     assert "INVALID_KEY" not in config
+
+
+def test_get_many():
+    config = Dict({"KEY": "b", "c": 123})
+
+    assert config.get_many(["KEY", "INVALID_KEY"]) == {"KEY": "b"}
@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 
-from classyconf.loaders import EnvFile
+from classyconf.loaders import EnvFile, Location, Source
+from classyconf.parsers import EnvFileParser, FastEnvFileParser
 
 
 def test_basic_config_object(envfile):
@@ -9,8 +12,9 @@ def test_basic_config_object(envfile):
     assert repr(config) == 'EnvFile("{}")'.format(envfile)
 
 
-def test_config_file_parsing(envfile):
-    config = EnvFile(envfile)
+@pytest.mark.parametrize("parser", [EnvFileParser, FastEnvFileParser])
+def test_config_file_parsing(envfile, parser):
+    config = EnvFile(envfile, parser=parser)
 
     assert config["KEY"] == "Value"
     assert config["KEY_EMPTY"] == ""
@@ -75,3 +79,172 @@ def test_reset(envfile):
     assert config.configs is not None
     config.reset()
     assert config.configs is None
+
+
+def test_get_many(envfile):
+    config = EnvFile(envfile)
+
+    assert config.get_many(["KEY", "UPDATED", "UNKNOWN"]) == {
+        "KEY": "Value",
+        "UPDATED": "text",
+    }
+
+
+def test_get_many_missing_envfile():
+    assert EnvFile("does-not-exist.env").get_many(["KEY"]) == {}
+
+
+def test_lazy_parsing_stops_early(envfile):
+    config = EnvFile(envfile, lazy=True)
+
+    assert config["KEY_EMPTY"] == ""
+    assert list(config.configs) == ["KEY", "KEY_EMPTY"]
+
+    assert config["INLINE_COMMENTS"] == "Foo"
+    assert list(config.configs)[-1] == "INLINE_COMMENTS"
+    assert config._pending is not None
+
+    assert "UNKNOWN" not in config
+    assert config._pending is None
+    assert config["MULTIPLE_LINES"] == "multiple lines config"
+
+
+def test_lazy_parsing_first_definition_wins(envfile):
+    config = EnvFile(envfile, lazy=True)
+
+    assert config["UPDATED"] == ""
+    assert config.get_many(["UPDATED", "KEY", "VAR"]) == {"UPDATED": "", "KEY": "Value"}
+
+
+def test_lazy_reset(envfile):
+    config = EnvFile(envfile, lazy=True)
+    config["KEY"]
+    pending = config._pending
+    config.reset()
+
+    assert config.configs is None
+    assert config._pending is None
+    with pytest.raises(StopIteration):
+        next(pending)
+
+
+def test_mmap_parsing(envfile):
+    config = EnvFile(envfile, mmap=True)
+
+    assert config["KEY"] == "Value"
+    assert config["UPDATED"] == "text"
+    assert config["MULTIPLE_LINES"] == "multiple lines config"
+    assert "UNKNOWN" not in config
+    assert config.get_many(["KEY", "VAR"]) == {"KEY": "Value"}
+
+
+def test_mmap_decodes_values_on_lookup(envfile):
+    config = EnvFile(envfile, mmap=True)
+    config.check()
+
+    assert type(config.configs._values["KEY"]) is int
+    assert config["KEY"] == "Value"
+    assert config.configs._values["KEY"] == "Value"
+
+
+def test_mmap_file_truncated_in_place(tmp_path):
+    filename = tmp_path / ".env"
+    filename.write_text("".join("K{}=value {}\n".format(n, n) for n in range(2000)))
+    config = EnvFile(str(filename), mmap=True, revalidate=5)
+    assert config["K1"] == "value 1"
+
+    with open(str(filename), "w") as file_:
+        file_.write("K0=x\n")
+    assert "K1999" not in config
+    assert config["K0"] == "x"
+
+
+@pytest.mark.parametrize(
+    "options,updated",
+    [
+        ({}, 12),
+        ({"parser": FastEnvFileParser}, 12),
+        ({"mmap": True}, 12),
+        ({"lazy": True}, 11),
+    ],
+)
+def test_locate(envfile, options, updated):
+    config = EnvFile(envfile, track_locations=True, **options)
+
+    assert config.locate("KEY") == (envfile, 1, 1)
+    assert config.locate("IGNORE_SPACE") == (envfile, 8, 1)
+    assert config.locate("UPDATED") == (envfile, updated, 1)
+    assert config.sources("UPDATED") == [
+        Source(config, "" if options.get("lazy") else "text", (envfile, updated, 1))
+    ]
+    assert config.sources("UNKNOWN") == []
+    assert config.locate("UNKNOWN") is None
+
+
+def test_locate_untracked(envfile):
+    config = EnvFile(envfile)
+
+    assert config.locate("KEY") == Location(envfile, None, None)
+
+
+@pytest.mark.parametrize("options", [{}, {"mmap": True}])
+def test_shared(tmp_path, options):
+    filename = tmp_path / ".env"
+    filename.write_text("KEY=value\n")
+    config = EnvFile(str(filename), shared=True, **options)
+    other = EnvFile(str(filename), shared=True, **options)
+
+    assert config["KEY"] == other["KEY"] == "value"
+    assert config.configs is other.configs
+
+    filename.write_text("KEY=changed\n")
+    config.reset()
+    assert config["KEY"] == "changed"
+    assert config.configs is not other.configs
+
+
+def test_reparse_changed_file(tmp_path):
+    filename = tmp_path / ".env"
+    filename.write_text("KEY=value\n")
+    config = EnvFile(str(filename))
+
+    assert config["KEY"] == "value"
+    assert not config.changed()
+
+    filename.write_text("KEY=new value\n")
+    assert config.changed()
+    assert config["KEY"] == "new value"
+    assert not config.changed()
+
+    filename.unlink()
+    assert "KEY" not in config
+
+
+def test_revalidate_interval(tmp_path):
+    filename = tmp_path / ".env"
+    filename.write_text("KEY=value\n")
+    config = EnvFile(str(filename), revalidate=10)
+
+    with patch("classyconf.loaders.monotonic", return_value=100):
+        assert config["KEY"] == "value"
+        filename.write_text("KEY=new value\n")
+        with patch("classyconf.loaders.os.stat") as stat:
+            assert config["KEY"] == "value"
+            assert not config.changed()
+        assert not stat.called
+
+    with patch("classyconf.loaders.monotonic", return_value=110):
+        assert config["KEY"] == "new value"
+
+
+def test_revalidate_never(tmp_path):
+    filename = tmp_path / ".env"
+    filename.write_text("KEY=value\n")
+    config = EnvFile(str(filename), revalidate=None)
+
+    assert config["KEY"] == "value"
+    filename.unlink()
+    assert config["KEY"] == "value"
+
+    config.reset()
+    assert "KEY" not in config
@@ -1,6 +1,7 @@
 import os
 import pytest
-from classyconf.loaders import Environment, EnvPrefix
+from classyconf.configuration import Configuration, Value
+from classyconf.loaders import Environment, EnvPrefix, MemoizedKeyfmt
 
 
 def test_env_prefix():
@@ -53,3 +54,117 @@ def test_custom_keyfmt():
     assert "test" == config["TEST"]
 
     del os.environ["_TEST"]
+
+
+def test_get_many():
+    os.environ["TEST"] = "test"
+    config = Environment()
+
+    assert config.get_many(["test", "UNKNOWN"]) == {"test": "test"}
+
+    del os.environ["TEST"]
+
+
+@pytest.fixture
+def environ(monkeypatch):
+    monkeypatch.setenv("MY_APP_DEBUG", "yes")
+    monkeypatch.setenv("MY_APP_NAME", "app")
+    monkeypatch.setenv("DEBUG", "no")
+    return monkeypatch
+
+
+@pytest.mark.parametrize("keyfmt", [EnvPrefix("MY_APP_"), lambda x: "MY_APP_" + x])
+def test_snapshot(environ, keyfmt):
+    config = Environment(keyfmt=keyfmt, snapshot=True)
+
+    assert "DEBUG" in config
+    assert config["DEBUG"] == "yes"
+    assert config.get_many(["DEBUG", "NAME", "UNKNOWN"]) == {
+        "DEBUG": "yes",
+        "NAME": "app",
+    }
+    assert "UNKNOWN" not in config
+    with pytest.raises(KeyError):
+        config["UNKNOWN"]
+
+    environ.setenv("MY_APP_DEBUG", "no")
+    assert config["DEBUG"] == "yes"
+    assert not config.changed()
+
+    config.reset()
+    assert config["DEBUG"] == "no"
+
+
+def test_snapshot_by_prefix(environ):
+    config = Environment(keyfmt=EnvPrefix("MY_APP_"), snapshot=True)
+    config.preload()
+
+    assert config.values == {"DEBUG": "yes", "NAME": "app"}
+    assert config["debug"] == "yes"
+
+
+def test_snapshot_revalidate(environ):
+    config = Environment(snapshot=True, revalidate=0)
+    assert config["DEBUG"] == "no"
+
+    environ.setenv("DEBUG", "yes")
+    assert config["DEBUG"] == "yes"
+    environ.delenv("DEBUG")
+    assert "DEBUG" not in config
+
+
+def test_snapshot_changed(environ):
+    config = Environment(snapshot=True, revalidate=60)
+    assert config["DEBUG"] == "no"
+    assert not config.changed()
+
+    environ.setenv("OTHER", "value")
+    assert config.changed()
+    config.reset()
+    assert config["DEBUG"] == "no"
+    assert not config.changed()
+
+
+def test_snapshot_negative_cache(environ):
+    class DefaultConf(Configuration):
+        MISSING = Value(default=0)
+
+    config = DefaultConf(loaders=[Environment(snapshot=True)], negative_cache=True)
+    assert config.MISSING == 0
+
+    environ.setenv("OTHER", "value")
+    assert config.MISSING == 0
+    assert config.MISSING == 0
+    assert config.negative_cache_hits == 2
+
+
+def test_changed_without_snapshot():
+    assert not Environment().changed()
+
+
+def test_env_prefix_is_memoized():
+    keyfmt = EnvPrefix("prefix_")
+
+    assert keyfmt("test") is keyfmt("test")
+    keyfmt.prefix = "other_"
+    assert keyfmt("test") == "other_TEST"
+
+
+def test_memoized_keyfmt():
+    calls = []
+
+    def formatter(x):
+        calls.append(x)
+        return "_{}".format(x)
+
+    keyfmt = MemoizedKeyfmt(formatter)
+    keyfmt.maxsize = 2
+    for name in ("a", "a", "b", "c", "c"):
+        assert keyfmt(name) == "_" + name
+
+    assert calls == ["a", "b", "c", "c"]
+    assert repr(keyfmt).startswith("MemoizedKeyfmt(<function")
+
+    os.environ["_TEST"] = "test"
+    assert Environment(keyfmt=keyfmt)["TEST"] == "test"
+    del os.environ["_TEST"]
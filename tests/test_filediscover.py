@@ -1,9 +1,13 @@
 import os
+import threading
+import time
+from functools import partial
+from unittest import mock
 
 import pytest
 
 from classyconf.exceptions import InvalidPath
-from classyconf.loaders import RecursiveSearch
+from classyconf.loaders import NOT_SET, EnvFile, IniFile, Location, RecursiveSearch
 
 
 def test_config_file_parsing(create_file, files_path):
@@ -109,3 +113,371 @@ def test_env_dir_wont_break_loader(files_path):
         os.removedirs(env_directory)
 
     assert "FOO" not in discovery
+
+
+def test_get_many(create_file, files_path):
+    create_file(files_path + "/../.env", "SPAM=eggs\nFOO=bar")
+    create_file(files_path + "/../settings.ini", "[settings]\nFOO=not_bar\nBAZ=qux")
+    discovery = RecursiveSearch(os.path.dirname(files_path))
+
+    assert discovery.get_many(["FOO", "SPAM", "BAZ", "not_found"]) == {
+        "FOO": "bar",
+        "SPAM": "eggs",
+        "BAZ": "qux",
+    }
+
+
+def test_sources(create_file, files_path):
+    envfile = files_path + "/../.env"
+    inifile = files_path + "/../settings.ini"
+    create_file(envfile, "SPAM=eggs\nFOO=bar")
+    create_file(inifile, "[settings]\nFOO=not_bar")
+    discovery = RecursiveSearch(os.path.dirname(files_path), track_locations=True)
+
+    sources = discovery.sources("FOO")
+    assert [(source.value, source.location) for source in sources] == [
+        ("bar", (os.path.realpath(envfile), 2, 1)),
+        ("not_bar", (os.path.realpath(inifile), 2, 1)),
+    ]
+    assert discovery.locate("SPAM") == (os.path.realpath(envfile), 1, 1)
+    assert discovery.locate("not_found") is None
+
+
+def test_get_filenames_like_glob(create_dir):
+    from glob import glob
+
+    _, path = create_dir("listing")
+    for name in ("a.ini", "b.cfg", ".hidden.ini", ".env", "c.txt"):
+        open(os.path.join(path, name), "w").close()
+    os.mkdir(os.path.join(path, "dir.ini"))
+
+    for patterns in (".env", "*.ini", ("*.ini", "*.cfg"), ".*", "*"):
+        if type(patterns) is str:
+            patterns = (patterns,)
+        expected = [
+            filename
+            for pattern in patterns
+            for filename in glob(os.path.join(path, pattern))
+            if os.path.isfile(filename)
+        ]
+        found = RecursiveSearch.get_filenames(path, patterns)
+        assert sorted(found) == sorted(expected)
+
+    assert RecursiveSearch.get_filenames(os.path.join(path, "a.ini"), "*") == []
+
+
+def test_list_each_directory_once(create_dir):
+    root_dir, start_path = create_dir("some/dirs")
+    with open(os.path.join(root_dir, "settings.ini"), "w") as file_:
+        file_.write("[settings]\nFOO=bar\n")
+
+    with mock.patch("os.scandir", side_effect=os.scandir) as scandir:
+        discovery = RecursiveSearch(start_path, root_path=root_dir)
+        assert discovery["FOO"] == "bar"
+
+    assert scandir.call_count == 3
+
+
+def test_parse_files_when_reached(create_dir):
+    root_dir, start_path = create_dir("start")
+    with open(os.path.join(start_path, ".env"), "w") as file_:
+        file_.write("FOO=near\n")
+    with open(os.path.join(root_dir, "settings.ini"), "w") as file_:
+        file_.write("[settings]\nFOO=far\nBAR=far\n")
+    with open(os.path.join(root_dir, "invalid.ini"), "w") as file_:
+        file_.write("[other]\nBAR=invalid\n")
+
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+    assert discovery["FOO"] == "near"
+    assert not any(
+        isinstance(loader, IniFile) and loader._initialized
+        for loader in discovery._found_files()
+    )
+
+    assert discovery["BAR"] == "far"
+    assert len(discovery._found_files()) == 3
+    assert len(discovery.config_files) == 2
+
+
+@pytest.fixture
+def search_tree(create_dir):
+    root_dir, start_path = create_dir("start")
+    near = os.path.join(start_path, ".env")
+    with open(near, "w") as file_:
+        file_.write("FOO=near\n")
+    far = os.path.join(root_dir, "settings.ini")
+    with open(far, "w") as file_:
+        file_.write("[settings]\nFOO=far\nBAR=far\n")
+    return root_dir, start_path, near, far
+
+
+def test_index(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+
+    assert discovery["FOO"] == "near"
+    assert discovery["BAR"] == "far"
+    assert "MISSING" not in discovery
+    assert discovery._index == {
+        "FOO": (0, "near"),
+        "BAR": (1, "far"),
+        "MISSING": (1, NOT_SET),
+    }
+
+    with mock.patch.object(IniFile, "__getitem__") as getitem:
+        assert discovery["BAR"] == "far"
+        assert "MISSING" not in discovery
+        assert discovery.get_many(["FOO", "BAR", "MISSING"]) == {
+            "FOO": "near",
+            "BAR": "far",
+        }
+    assert not getitem.called
+
+    assert discovery.locate("BAR") == Location(far, None, None)
+
+
+def test_index_get_many(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+
+    assert discovery.get_many(["FOO", "BAR", "MISSING"]) == {
+        "FOO": "near",
+        "BAR": "far",
+    }
+    assert discovery._index == {
+        "FOO": (0, "near"),
+        "BAR": (1, "far"),
+        "MISSING": (1, NOT_SET),
+    }
+
+
+def test_index_changed_file(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+    assert discovery.get_many(["FOO", "BAR", "MISSING"])
+
+    with open(far, "a") as file_:
+        file_.write("MISSING=found\n")
+    assert discovery.changed()
+    assert discovery["FOO"] == "near"
+    assert discovery["MISSING"] == "found"
+    assert discovery._index == {"FOO": (0, "near"), "MISSING": (1, "found")}
+
+    with open(near, "a") as file_:
+        file_.write("BAR=near\n")
+    assert discovery["BAR"] == "near"
+
+
+def test_index_changed_ini_file(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+    assert discovery["BAR"] == "far"
+
+    with open(far, "w") as file_:
+        file_.write("[settings]\nBAR=edited\n")
+    assert discovery["BAR"] == "edited"
+
+
+def test_loader_factories(search_tree):
+    root_dir, start_path, near, far = search_tree
+
+    class SettingsIniFile(IniFile):
+        def __init__(self, filename):
+            super().__init__(filename, section="settings")
+
+    for factory in (partial(IniFile, section="settings"), SettingsIniFile):
+        discovery = RecursiveSearch(
+            start_path, root_path=root_dir, filetypes=(("*.ini", factory),)
+        )
+        assert discovery["BAR"] == "far"
+
+        with open(far, "w") as file_:
+            file_.write("[settings]\nBAR=edited\n")
+        assert discovery["BAR"] == "edited"
+        with open(far, "w") as file_:
+            file_.write("[settings]\nFOO=far\nBAR=far\n")
+
+
+def test_index_revalidate(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir, revalidate=None)
+    assert discovery["FOO"] == "near"
+
+    with open(near, "w") as file_:
+        file_.write("FOO=changed\n")
+    assert discovery["FOO"] == "near"
+
+    discovery.reset()
+    assert discovery["FOO"] == "changed"
+
+
+def test_lazy_walk(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir, lazy=True)
+
+    with mock.patch("os.scandir", side_effect=os.scandir) as scandir:
+        assert discovery["FOO"] == "near"
+        assert scandir.call_count == 1
+        assert [loader.filename for loader in discovery._found_files()] == [near]
+
+        assert discovery["BAR"] == "far"
+        assert "MISSING" not in discovery
+        assert scandir.call_count == 2
+
+        assert "OTHER" not in discovery
+        assert scandir.call_count == 2
+
+
+def test_lazy_walk_same_files(search_tree):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir)
+    lazy = RecursiveSearch(start_path, root_path=root_dir, lazy=True)
+
+    assert lazy.get_many(["FOO", "BAR"]) == discovery.get_many(["FOO", "BAR"])
+    assert [source[1:] for source in lazy.sources("FOO")] == [
+        source[1:] for source in discovery.sources("FOO")
+    ]
+    assert [loader.filename for loader in lazy.config_files] == [near, far]
+
+    lazy.reset()
+    assert lazy._found is None
+    assert lazy["BAR"] == "far"
+
+
+def make_old(*paths, age=60):
+    # Persisted files and directories must be older than RACY_SECONDS.
+    mtime = time.time() - age
+    for path in paths:
+        os.utime(path, (mtime, mtime))
+
+
+def test_persist(search_tree, tmp_path, monkeypatch):
+    root_dir, start_path, near, far = search_tree
+    make_old(near, far, start_path, root_dir)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    discovery = RecursiveSearch(start_path, root_path=root_dir, persist=True)
+    assert discovery["BAR"] == "far"
+    assert len(os.listdir(str(tmp_path / "classyconf"))) == 1
+
+    with mock.patch("os.scandir") as scandir:
+        with mock.patch.object(IniFile, "_load") as load:
+            warm = RecursiveSearch(start_path, root_path=root_dir, persist=True)
+            assert warm["FOO"] == "near"
+            assert warm["BAR"] == "far"
+            assert "MISSING" not in warm
+    assert not scandir.called
+    assert not load.called
+
+
+def test_persist_invalidation(search_tree, tmp_path):
+    root_dir, start_path, near, far = search_tree
+    make_old(near, far, start_path, root_dir)
+    options = {"root_path": root_dir, "persist": str(tmp_path)}
+    assert RecursiveSearch(start_path, **options).get_many(["FOO", "BAR"])
+
+    with open(far, "w") as file_:
+        file_.write("[settings]\nBAR=edited\n")
+    make_old(far, age=30)
+    assert RecursiveSearch(start_path, **options)["BAR"] == "edited"
+
+    added = os.path.join(start_path, "added.ini")
+    with open(added, "w") as file_:
+        file_.write("[settings]\nBAR=added\n")
+    make_old(added, start_path, age=30)
+    assert RecursiveSearch(start_path, **options)["BAR"] == "added"
+
+    os.remove(added)
+    make_old(start_path, age=20)
+    assert RecursiveSearch(start_path, **options)["BAR"] == "edited"
+
+
+def test_persist_racy_files(search_tree, tmp_path):
+    root_dir, start_path, near, far = search_tree
+    options = {"root_path": root_dir, "persist": str(tmp_path)}
+    assert RecursiveSearch(start_path, **options)["FOO"] == "near"
+
+    with mock.patch("os.scandir", side_effect=os.scandir) as scandir:
+        assert RecursiveSearch(start_path, **options)["FOO"] == "near"
+    assert scandir.called
+
+
+def test_persist_corrupt_index(search_tree, tmp_path):
+    root_dir, start_path, near, far = search_tree
+    discovery = RecursiveSearch(start_path, root_path=root_dir, persist=str(tmp_path))
+    with open(discovery._index_filename(), "wb") as index:
+        index.write(b"corrupt")
+
+    assert discovery["FOO"] == "near"
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_workers(create_dir, lazy):
+    root_dir, start_path = create_dir("a/b/c")
+    path = start_path
+    for level in range(4):
+        with open(os.path.join(path, ".env"), "w") as file_:
+            file_.write("FOO=env {}\nLEVEL_{}=yes\n".format(level, level))
+        with open(os.path.join(path, "settings.ini"), "w") as file_:
+            file_.write("[settings]\nFOO=ini {}\nBAR=ini {}\n".format(level, level))
+        path = os.path.dirname(path)
+
+    serial = RecursiveSearch(start_path, root_path=root_dir, lazy=lazy)
+    parallel = RecursiveSearch(start_path, root_path=root_dir, lazy=lazy, workers=4)
+
+    for key in ("FOO", "BAR", "LEVEL_3", "MISSING"):
+        assert (key in parallel) == (key in serial)
+        assert parallel.get_many([key]) == serial.get_many([key])
+    assert [loader.filename for loader in parallel.config_files] == [
+        loader.filename for loader in serial.config_files
+    ]
+
+
+def test_persist_workers(create_dir, tmp_path):
+    root_dir, start_path = create_dir("a/b/c/d/e/f")
+    path = start_path
+    paths = []
+    while True:
+        filename = os.path.join(path, "settings.ini")
+        with open(filename, "w") as file_:
+            file_.write("[settings]\nFOO={}\n".format(path))
+        paths += [filename, path]
+        if path == root_dir:
+            break
+        path = os.path.dirname(path)
+    make_old(*paths)
+    options = {"root_path": root_dir, "persist": str(tmp_path), "workers": 4}
+
+    discovery = RecursiveSearch(start_path, **options)
+    assert discovery["FOO"] == start_path
+    assert len({id(loader.shared) for loader in discovery._found_files()}) == 1
+    assert len(discovery._listings) == 7
+
+    with mock.patch("os.scandir") as scandir:
+        with mock.patch.object(IniFile, "_load") as load:
+            warm = RecursiveSearch(start_path, **options)
+            assert warm["FOO"] == start_path
+            assert len(warm.config_files) == 7
+    assert not scandir.called
+    assert not load.called
+
+
+def test_workers_failure(search_tree):
+    root_dir, start_path, near, far = search_tree
+    threads = set()
+
+    class BrokenEnvFile(EnvFile):
+        def check(self):
+            threads.add(threading.current_thread())
+            raise RuntimeError("Broken")
+
+    filetypes = ((".env", BrokenEnvFile), ("*.ini", IniFile))
+    discovery = RecursiveSearch(
+        start_path, root_path=root_dir, filetypes=filetypes, workers=2
+    )
+
+    assert len(discovery._found_files()) == 2
+    assert threads and threading.current_thread() not in threads
+    assert discovery._found_files()[1]._initialized
+    with pytest.raises(RuntimeError):
+        discovery["BAR"]
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+import classyconf
+
+HEAVY_MODULES = ["ast", "asyncio", "configparser", "glob", "threading", "typing"]
+
+
+def imported_modules(statement):
+    script = "import sys; {}; print(' '.join(sys.modules))".format(statement)
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return set(output.decode().split())
+
+
+@pytest.mark.parametrize(
+    "statement,lazy",
+    [
+        ("import classyconf", ["classyconf.configuration", "classyconf.loaders"]),
+        ("from classyconf import Configuration, Value, Environment", []),
+    ],
+)
+def test_import_is_lazy(statement, lazy):
+    # Modules imported at startup, e.g. by coverage, don't count.
+    modules = imported_modules(statement) - imported_modules("pass")
+    assert not modules.intersection(HEAVY_MODULES + lazy)
+
+
+def test_lazy_exports():
+    for name in classyconf.__all__:
+        assert getattr(classyconf, name) is not None
+    assert set(classyconf.__all__) <= set(dir(classyconf))
+
+
+def test_submodules_as_attributes():
+    script = "import classyconf; print(classyconf.loaders.RecursiveSearch.__name__)"
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert output.decode().strip() == "RecursiveSearch"
+    assert classyconf.exceptions.InvalidPath
+
+
+def test_unknown_export():
+    with pytest.raises(AttributeError):
+        classyconf.does_not_exist
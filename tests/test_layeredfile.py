@@ -0,0 +1,147 @@
+from unittest import mock
+
+import pytest
+
+from classyconf.loaders import IniFile, LayeredIniFile, Source
+
+
+@pytest.fixture
+def layers(tmp_path):
+    local = tmp_path / "app.ini"
+    local.write_text("[settings]\nKEY=local\n")
+    user = tmp_path / "user.ini"
+    user.write_text("[DEFAULT]\nDEBUG=yes\n\n[settings]\nKEY=user\nNAME=user\n")
+    system = tmp_path / "system.ini"
+    system.write_text("[settings]\nNAME=system\nPORT=80\n")
+    return [str(local), str(user), str(system)]
+
+
+def test_basic_config_object(layers):
+    config = LayeredIniFile(layers)
+
+    assert repr(config) == "LayeredIniFile({!r})".format(layers)
+
+
+def test_precedence(layers):
+    config = LayeredIniFile(layers)
+
+    assert config["KEY"] == "local"
+    assert config["NAME"] == "user"
+    assert config["PORT"] == "80"
+    assert config["DEBUG"] == "yes"
+    assert "MISSING" not in config
+    with pytest.raises(KeyError):
+        config["MISSING"]
+
+
+def test_same_as_inifile_chain(layers):
+    config = LayeredIniFile(layers)
+    chain = [IniFile(filename) for filename in layers]
+
+    for key in ("KEY", "NAME", "PORT", "DEBUG"):
+        assert config[key] == next(c[key] for c in chain if key in c)
+
+
+def test_get_many(layers):
+    config = LayeredIniFile(layers)
+
+    assert config.get_many(["KEY", "PORT", "MISSING"]) == {"KEY": "local", "PORT": "80"}
+
+
+def test_skip_missing_files_and_sections(tmp_path, layers):
+    other = tmp_path / "other.ini"
+    other.write_text("[other]\nKEY=other\n")
+    config = LayeredIniFile([str(tmp_path / "missing.ini"), str(other), layers[-1]])
+
+    assert config["NAME"] == "system"
+    assert "KEY" not in config
+
+
+def test_no_files(tmp_path):
+    config = LayeredIniFile([str(tmp_path / "missing.ini")])
+
+    assert not config.check()
+    assert "KEY" not in config
+    assert config.get_many(["KEY"]) == {}
+    with pytest.raises(KeyError):
+        config["KEY"]
+
+
+def test_keyfmt(layers):
+    config = LayeredIniFile(layers, keyfmt=str.upper)
+
+    assert config["key"] == "local"
+
+
+def test_interpolation(tmp_path):
+    local = tmp_path / "app.ini"
+    local.write_text("[settings]\nhost=localhost\n")
+    system = tmp_path / "system.ini"
+    system.write_text("[settings]\nhost=example.com\nurl=http://%(host)s/\n")
+    files = [str(local), str(system)]
+
+    assert LayeredIniFile(files)["url"] == "http://%(host)s/"
+    assert LayeredIniFile(files, interpolation=True)["url"] == "http://localhost/"
+
+
+def test_reload_changed_layer(layers):
+    config = LayeredIniFile(layers, revalidate=0)
+    assert config["NAME"] == "user"
+
+    load = IniFile._load
+    with mock.patch.object(IniFile, "_load", autospec=True, side_effect=load) as load:
+        assert config["NAME"] == "user"
+        assert not load.called
+
+        with open(layers[1], "w") as file_:
+            file_.write("[settings]\nKEY=changed\n")
+        assert config["NAME"] == "system"
+        assert config["KEY"] == "local"
+        assert [call.args[0].filename for call in load.call_args_list] == [layers[1]]
+
+
+def test_revalidate(layers):
+    config = LayeredIniFile(layers)
+    assert config["KEY"] == "local"
+
+    with open(layers[0], "w") as file_:
+        file_.write("[settings]\n")
+    assert config["KEY"] == "local"
+    assert not config.changed()
+
+    config.reset()
+    assert config["KEY"] == "user"
+
+
+def test_file_created_later(tmp_path, layers):
+    config = LayeredIniFile([str(tmp_path / "later.ini")] + layers)
+    assert config["KEY"] == "local"
+
+    (tmp_path / "later.ini").write_text("[settings]\nKEY=later\n")
+    assert config["KEY"] == "later"
+
+
+def test_changed(layers):
+    config = LayeredIniFile(layers, revalidate=0)
+    assert not config.changed()
+    assert config["KEY"] == "local"
+    assert not config.changed()
+
+    with open(layers[2], "a") as file_:
+        file_.write("NEW=value\n")
+    assert config.changed()
+    assert config["NEW"] == "value"
+    assert not config.changed()
+
+
+def test_locate(layers):
+    config = LayeredIniFile(layers, track_locations=True)
+
+    assert config.locate("NAME") == (layers[1], 6, 1)
+    assert config.locate("PORT") == (layers[2], 3, 1)
+    assert config.locate("MISSING") is None
+    assert config.sources("NAME") == [
+        Source(config.layers[1], "user", (layers[1], 6, 1)),
+        Source(config.layers[2], "system", (layers[2], 2, 1)),
+    ]
+    assert config.sources("MISSING") == []
@@ -0,0 +1,177 @@
+import configparser
+import io
+import random
+
+import pytest
+
+from classyconf.parsers import (
+    EnvFileParser,
+    FastEnvFileParser,
+    IniSectionParser,
+    MmapEnvFileParser,
+    interpolate,
+)
+
+
+def parse(parser_class, content):
+    return list(parser_class(io.StringIO(content)).parse_config())
+
+
+def parse_mapped(tmp_path, content):
+    filename = tmp_path / "envfile"
+    filename.write_bytes(content.encode("utf-8"))
+    with open(filename, "rb") as file_:
+        return dict(MmapEnvFileParser(file_).parse())
+
+
+def locations(parser):
+    list(parser.parse_config())
+    return parser.locations
+
+
+@pytest.mark.parametrize("alphabet", ["ab= =#'\"\\\n\n \t", "abc  ==\n", "a'\"#\\= \n"])
+def test_fast_parser_matches_state_machine(alphabet):
+    rnd = random.Random(0)
+    for _ in range(2000):
+        content = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 80)))
+        assert parse(FastEnvFileParser, content) == parse(EnvFileParser, content)
+
+
+def test_fast_parser_matches_state_machine_on_envfile(envfile):
+    with open(envfile) as file_:
+        content = file_.read()
+    assert parse(FastEnvFileParser, content) == parse(EnvFileParser, content)
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ("KEY=value\n", [("KEY", "value")]),
+        ("  KEY = value  \n", [("KEY", "value")]),
+        ("=KEY=value", [("=KEY", "value")]),
+        ("KEY='quoted # value'  # comment\n", [("KEY", "quoted # value")]),
+        ("KEY=multiple \\\n  lines\n", [("KEY", "multiple   lines")]),
+        ("# it's a comment\nKEY= spaced\n", [("KEY", " spaced")]),
+        ("NO_VALUE", [("NO_VALUE", "")]),
+    ],
+)
+def test_parsers(content, expected):
+    assert parse(EnvFileParser, content) == expected
+    assert parse(FastEnvFileParser, content) == expected
+
+
+@pytest.mark.parametrize(
+    "alphabet", ["ab= =#'\"\\\n\n \t", "a'\"#\\= \n", "ab=\r\n \u00e9\x1c"]
+)
+def test_mmap_parser_matches_state_machine(tmp_path, alphabet):
+    rnd = random.Random(0)
+    for _ in range(500):
+        content = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 80)))
+        text = io.StringIO(content, newline=None).read()
+        assert parse_mapped(tmp_path, content) == dict(parse(EnvFileParser, text))
+
+
+def test_mmap_parser_empty_file(tmp_path):
+    assert parse_mapped(tmp_path, "") == {}
+
+
+def test_parsers_track_locations(tmp_path):
+    rnd = random.Random(0)
+    filename = tmp_path / "envfile"
+    for _ in range(1000):
+        content = "".join(rnd.choice("ab= =#'\"\\\n\n \t") for _ in range(80))
+        filename.write_text(content)
+        expected = locations(EnvFileParser(io.StringIO(content), True))
+        assert locations(FastEnvFileParser(io.StringIO(content), True)) == expected
+        with open(filename, "rb") as file_:
+            assert locations(MmapEnvFileParser(file_, track_locations=True)) == expected
+
+
+def test_parser_locations():
+    content = "# comment\n\n  KEY = value\nQUOTED='a\\\n b'\n  \tLAST=1"
+    expected = {"KEY": (3, 3), "QUOTED": (4, 1), "\tLAST": (6, 3)}
+    assert locations(EnvFileParser(io.StringIO(content), True)) == expected
+    assert locations(FastEnvFileParser(io.StringIO(content), True)) == expected
+    assert FastEnvFileParser(io.StringIO(content)).locations is None
+
+
+def random_inifile(rnd):
+    def word():
+        return "".join(rnd.choice("abAB %()s:=[]#;") for _ in range(rnd.randint(0, 6)))
+
+    lines = [rnd.choice(["[settings]", "[DEFAULT]", "[other]"])]
+    for _ in range(rnd.randint(0, 10)):
+        indent = rnd.choice(["", "", " ", "\t", "    "])
+        kind = rnd.random()
+        if kind < 0.15:
+            name = rnd.choice(["settings", "DEFAULT", "other", "x]y", ""])
+            lines.append(indent + "[" + name + "]" + rnd.choice(["", " ", "]"]))
+        elif kind < 0.25:
+            lines.append(indent + rnd.choice(["#", ";"]) + word())
+        elif kind < 0.35:
+            lines.append(rnd.choice(["", "  "]))
+        elif kind < 0.5:
+            lines.append(indent + rnd.choice(["%", "%%", "%(a)s", "%(a", ""]) + word())
+        else:
+            lines.append(
+                indent
+                + rnd.choice(["a", "B", "A b", "c"])
+                + rnd.choice([" = ", "=", ":", " : ", ""])
+                + rnd.choice(["%(a)s", "%(b)s", "%%", "%", "", "v"])
+                + word()
+            )
+    return "\n".join(lines) + rnd.choice(["", "\n"])
+
+
+def get_or_error(get, *args):
+    try:
+        return get(*args)
+    except (configparser.Error, TypeError) as error:
+        return type(error), str(error)
+
+
+def test_ini_section_parser_matches_config_parser():
+    rnd = random.Random(0)
+    for _ in range(3000):
+        content = random_inifile(rnd)
+        parser = configparser.ConfigParser(allow_no_value=True)
+        try:
+            parser.read_string(content)
+        except (configparser.Error, AttributeError):
+            continue  # AttributeError: continuation of an option without value
+
+        values = IniSectionParser(io.StringIO(content), "settings").parse()
+        if not parser.has_section("settings"):
+            assert values is None
+            continue
+
+        assert values == {
+            option: parser.get("settings", option, raw=True)
+            for option in parser.options("settings")
+        }
+        for option, value in values.items():
+            if value is not None:
+                assert get_or_error(
+                    interpolate, values, "settings", option, value
+                ) == get_or_error(parser.get, "settings", option)
+
+
+def test_ini_section_parser():
+    content = (
+        "[DEFAULT]\nshared = default\nkey = default\n"
+        "[other]\nkey = other\n  [settings]\n"
+        "[settings]\n"
+        "KEY : value\n"
+        "multi =\n    first\n\n    second\n\n"
+        "# comment\nflag\n"
+    )
+    parser = IniSectionParser(io.StringIO(content), "settings", track_locations=True)
+    assert parser.parse() == {
+        "shared": "default",
+        "key": "value",
+        "multi": "\nfirst\n\nsecond",
+        "flag": None,
+    }
+    assert parser.locations["settings"]["key"] == (8, 1)
+    assert parser.locations["DEFAULT"]["shared"] == (2, 1)
+    assert IniSectionParser(io.StringIO(content), "missing").parse() is None
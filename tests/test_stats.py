@@ -0,0 +1,79 @@
+import pytest
+
+from classyconf.configuration import Configuration, Value
+from classyconf.exceptions import UnknownConfiguration
+from classyconf.loaders import Dict
+from classyconf.stats import LookupEvent, LookupStats
+
+
+class StatsConf(Configuration):
+    FOUND = Value(default=0)
+    MISSING = Value(default=False)
+    UNKNOWN = Value()
+
+
+@pytest.fixture
+def loaders():
+    return [Dict({}), Dict({"FOUND": "1"})]
+
+
+def test_stats_disabled_by_default(loaders):
+    config = StatsConf(loaders=loaders)
+    config.FOUND
+
+    assert config.stats() is None
+
+
+def test_instrument_default_meta():
+    class InstrumentedConf(Configuration):
+        class Meta:
+            instrument = True
+
+    assert isinstance(InstrumentedConf()._lookup, LookupStats)
+
+
+def test_stats(loaders):
+    config = StatsConf(loaders=loaders, instrument=True, negative_cache=True)
+    assert config.FOUND == 1
+    assert config.FOUND == 1
+    assert config.MISSING is False
+    assert config.MISSING is False
+
+    stats = config.stats()
+    found = stats["keys"]["FOUND"]
+    assert found["lookups"] == 2
+    assert found["defaults"] == 0
+    assert found["loader"] == repr(loaders[1])
+    assert 0 < found["max_time"] <= found["time"]
+    assert found["cast_time"] > 0
+
+    missing = stats["keys"]["MISSING"]
+    assert missing["lookups"] == 1
+    assert missing["defaults"] == 1
+    assert missing["loader"] is None
+
+    first, second = stats["loaders"]
+    assert (first["loader"], first["hits"], first["misses"]) == (repr(loaders[0]), 0, 3)
+    assert (second["loader"], second["hits"], second["misses"]) == (
+        repr(loaders[1]),
+        2,
+        1,
+    )
+    assert first["time"] > 0
+    assert stats["negative_cache_hits"] == 1
+
+
+def test_on_lookup_hook(loaders):
+    events = []
+    config = StatsConf(loaders=loaders, on_lookup=events.append)
+    config.FOUND
+    with pytest.raises(UnknownConfiguration):
+        config.UNKNOWN
+
+    assert [event.key for event in events] == ["FOUND", "UNKNOWN"]
+    assert all(isinstance(event, LookupEvent) for event in events)
+    assert events[0].loader is loaders[1]
+    assert events[0].misses == 1
+    assert events[1].loader is None
+    assert events[1].misses == 2
+    assert config.stats()["keys"]["UNKNOWN"]["defaults"] == 1
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from classyconf.configuration import Configuration, Value
+from classyconf.exceptions import UnknownConfiguration
+from classyconf.loaders import Dict
+
+THREADS = 16
+
+
+class SlowCast:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        time.sleep(0.05)
+        return value
+
+
+def run_concurrently(func):
+    barrier = threading.Barrier(THREADS)
+    results = []
+
+    def target():
+        barrier.wait()
+        try:
+            results.append(func())
+        except Exception as error:
+            results.append(error)
+
+    threads = [threading.Thread(target=target) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_thread_safe_default_meta():
+    class ThreadSafeConf(Configuration):
+        class Meta:
+            thread_safe = True
+
+    config = ThreadSafeConf()
+    assert config._resolve == config._resolve_single_flight
+    config = Configuration()
+    assert config._resolve != config._resolve_single_flight
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_single_flight(cache):
+    cast = SlowCast()
+
+    class SlowConf(Configuration):
+        SLOW = Value(cast=cast)
+
+    config = SlowConf(loaders=[Dict({"SLOW": "value"})], cache=cache, thread_safe=True)
+
+    assert run_concurrently(lambda: config.SLOW) == ["value"] * THREADS
+    assert cast.calls == 1
+    assert config._flights == {}
+
+
+def test_single_flight_shares_errors():
+    class MissingConf(Configuration):
+        MISSING = Value(cast=SlowCast())
+
+    config = MissingConf(loaders=[Dict({})], thread_safe=True)
+    results = run_concurrently(lambda: config.MISSING)
+
+    assert all(isinstance(result, UnknownConfiguration) for result in results)
+    assert config._flights == {}
+
+
+def test_single_flight_per_default():
+    class SlowDict(Dict):
+        def __getitem__(self, item):
+            time.sleep(0.05)
+            return super().__getitem__(item)
+
+    config = Configuration(loaders=[SlowDict({})], thread_safe=True)
+    calls = iter(range(THREADS))
+
+    def lookup():
+        if next(calls) % 2:
+            return config("TIMEOUT", default=30)
+        return config("TIMEOUT")
+
+    results = run_concurrently(lookup)
+
+    assert results.count(30) == THREADS // 2
+    errors = [result for result in results if result != 30]
+    assert all(isinstance(error, UnknownConfiguration) for error in errors)
+    assert config._flights == {}
+
+
+def test_reset_while_resolving():
+    class ManyConf(Configuration):
+        class Meta:
+            loaders = [Dict({"VALUE_{}".format(i): str(i) for i in range(50)})]
+
+        locals().update({"VALUE_{}".format(i): Value(default=0) for i in range(50)})
+
+    config = ManyConf(cache=True, thread_safe=True)
+
+    def read_and_reset():
+        for i in range(50):
+            assert getattr(config, "VALUE_{}".format(i)) == i
+            if i % 10 == 0:
+                config.reset()
+        return True
+
+    assert run_concurrently(read_and_reset) == [True] * THREADS